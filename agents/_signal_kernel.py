@@ -0,0 +1,269 @@
+"""
+Numba-compiled hot path for the Market Analysis Agent.
+
+Swing-point detection, trendline fitting, and the breakout/retest scan
+are pure numeric loops over small float64 arrays — ideal JIT targets.
+The kernels here mirror the reference implementations in
+agents/market_analysis_agent.py exactly; only the string-heavy
+TradeSignal construction stays in Python.
+
+numba is optional: without it the kernels run as plain Python and the
+agent behaves identically, just slower.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional — fall back to plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _swing_idx(prices: np.ndarray, lookback: int, is_high: bool) -> np.ndarray:
+    """Indices where prices[i] is the strict local extreme over ±lookback."""
+    n = prices.shape[0]
+    out = np.empty(n, np.int64)
+    k = 0
+    for i in range(lookback, n - lookback):
+        p = prices[i]
+        if is_high:
+            ok = p > prices[i - 1] and p > prices[i + 1]
+            if ok:
+                for j in range(i - lookback, i + lookback + 1):
+                    if prices[j] > p:
+                        ok = False
+                        break
+        else:
+            ok = p < prices[i - 1] and p < prices[i + 1]
+            if ok:
+                for j in range(i - lookback, i + lookback + 1):
+                    if prices[j] < p:
+                        ok = False
+                        break
+        if ok:
+            out[k] = i
+            k += 1
+    return out[:k]
+
+
+@njit(cache=True)
+def _fit_line_nb(x: np.ndarray, y: np.ndarray):
+    """Closed-form degree-1 least squares → (slope, intercept, ok)."""
+    m = x.shape[0]
+    xm = x.mean()
+    ym = y.mean()
+    num = 0.0
+    den = 0.0
+    for i in range(m):
+        dx = x[i] - xm
+        num += dx * (y[i] - ym)
+        den += dx * dx
+    if den == 0.0:
+        return 0.0, 0.0, False
+    slope = num / den
+    return slope, ym - slope * xm, True
+
+
+@njit(cache=True)
+def _suffix_extremes(highs: np.ndarray, lows: np.ndarray):
+    """Running max-of-highs / min-of-lows from each bar to the end.
+
+    suf_hi[i] == highs[i:].max() and suf_lo[i] == lows[i:].min(), so the
+    post-break extreme for any candidate breakout bar is an O(1) lookup.
+    """
+    n = highs.shape[0]
+    suf_hi = np.empty(n, np.float64)
+    suf_lo = np.empty(n, np.float64)
+    suf_hi[n - 1] = highs[n - 1]
+    suf_lo[n - 1] = lows[n - 1]
+    for i in range(n - 2, -1, -1):
+        suf_hi[i] = max(highs[i], suf_hi[i + 1])
+        suf_lo[i] = min(lows[i], suf_lo[i + 1])
+    return suf_hi, suf_lo
+
+
+@njit(cache=True)
+def _trendlines(highs: np.ndarray, lows: np.ndarray, swing_lookback: int):
+    """
+    Fit both direction trendlines through the last ≤3 swing points.
+
+    Returns (ok_long, slope_long, int_long, ok_short, slope_short,
+    int_short). This is the expensive half of the detector — swing scan
+    plus line fit — and is cacheable per bar: swing structure only moves
+    when a new bar closes.
+    """
+    ok_long = False
+    slope_long = 0.0
+    int_long = 0.0
+    sw = _swing_idx(highs, swing_lookback, True)
+    if sw.shape[0] >= 2:
+        m = min(3, sw.shape[0])
+        x = np.empty(m, np.float64)
+        y = np.empty(m, np.float64)
+        for i in range(m):
+            idx = sw[sw.shape[0] - m + i]
+            x[i] = idx
+            y[i] = highs[idx]
+        slope, intercept, ok = _fit_line_nb(x, y)
+        if ok and slope < 0.0:      # long needs a downtrend line
+            ok_long = True
+            slope_long = slope
+            int_long = intercept
+
+    ok_short = False
+    slope_short = 0.0
+    int_short = 0.0
+    sw = _swing_idx(lows, swing_lookback, False)
+    if sw.shape[0] >= 2:
+        m = min(3, sw.shape[0])
+        x = np.empty(m, np.float64)
+        y = np.empty(m, np.float64)
+        for i in range(m):
+            idx = sw[sw.shape[0] - m + i]
+            x[i] = idx
+            y[i] = lows[idx]
+        slope, intercept, ok = _fit_line_nb(x, y)
+        if ok and slope > 0.0:      # short needs an uptrend line
+            ok_short = True
+            slope_short = slope
+            int_short = intercept
+
+    return ok_long, slope_long, int_long, ok_short, slope_short, int_short
+
+
+@njit(cache=True)
+def _detect_with_line(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    suf_hi: np.ndarray,
+    suf_lo: np.ndarray,
+    slope: float,
+    intercept: float,
+    tolerance: float,
+    is_long: bool,
+):
+    """
+    Breakout/retest scan against an already-fitted trendline.
+
+    Returns (found, entry, stop, target, bars_since, rr) — entry is the
+    raw closing price; the caller handles rounding and signal assembly.
+    """
+    no_signal = (False, 0.0, 0.0, 0.0, 0, 0.0)
+    n = closes.shape[0]
+
+    # 1. Most recent trendline cross within the last 10 bars
+    breakout_bar = -1
+    lo = n - 10 if n - 10 > 1 else 1
+    for i in range(n - 1, lo - 1, -1):
+        tl_prev = slope * (i - 1) + intercept
+        tl_curr = slope * i + intercept
+        if is_long:
+            if closes[i - 1] < tl_prev and closes[i] >= tl_curr:
+                breakout_bar = i
+                break
+        else:
+            if closes[i - 1] > tl_prev and closes[i] <= tl_curr:
+                breakout_bar = i
+                break
+    if breakout_bar < 0:
+        return no_signal
+
+    bars_since = (n - 1) - breakout_bar
+    if bars_since < 1:
+        return no_signal
+
+    # 2. Post-break extremes + retest-zone / bounce confirmation
+    tl_now = slope * (n - 1) + intercept
+    current_close = closes[n - 1]
+
+    if is_long:
+        breakout_high = suf_hi[breakout_bar]
+        retest_low = suf_lo[breakout_bar]
+        if retest_low > tl_now * (1.0 + tolerance):
+            return no_signal   # never pulled back to trendline
+        if current_close < tl_now * (1.0 - tolerance):
+            return no_signal   # closed back below — invalidated
+        entry = current_close
+        stop = round(retest_low * (1.0 - 0.002), 2)
+        target = round(breakout_high, 2)
+        risk = entry - stop
+        reward = target - entry
+    else:
+        breakdown_low = suf_lo[breakout_bar]
+        retest_high = suf_hi[breakout_bar]
+        if retest_high < tl_now * (1.0 - tolerance):
+            return no_signal
+        if current_close > tl_now * (1.0 + tolerance):
+            return no_signal
+        entry = current_close
+        stop = round(retest_high * (1.0 + 0.002), 2)
+        target = round(breakdown_low, 2)
+        risk = stop - entry
+        reward = entry - target
+
+    if risk <= 0.0 or reward <= 0.0:
+        return no_signal
+
+    return True, entry, stop, target, bars_since, reward / risk
+
+
+@njit(cache=True)
+def _detect_pair(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    ok_long: bool,
+    slope_long: float,
+    int_long: float,
+    ok_short: bool,
+    slope_short: float,
+    int_short: float,
+    tolerance: float,
+):
+    """
+    Run both direction scans against pre-fitted trendlines.
+
+    Returns (direction, entry, stop, target, bars_since, rr) with
+    direction +1 for long, -1 for short, 0 for no signal.
+    """
+    suf_hi, suf_lo = _suffix_extremes(highs, lows)
+    if ok_long:
+        found, entry, stop, target, bars_since, rr = _detect_with_line(
+            highs, lows, closes, suf_hi, suf_lo, slope_long, int_long, tolerance, True
+        )
+        if found:
+            return 1, entry, stop, target, bars_since, rr
+    if ok_short:
+        found, entry, stop, target, bars_since, rr = _detect_with_line(
+            highs, lows, closes, suf_hi, suf_lo, slope_short, int_short, tolerance, False
+        )
+        if found:
+            return -1, entry, stop, target, bars_since, rr
+    return 0, 0.0, 0.0, 0.0, 0, 0.0
+
+
+@njit(cache=True)
+def _detect_both(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    swing_lookback: int,
+    tolerance: float,
+):
+    """Fit trendlines and scan both directions in one call (uncached path)."""
+    ok_l, sl_l, ic_l, ok_s, sl_s, ic_s = _trendlines(highs, lows, swing_lookback)
+    return _detect_pair(highs, lows, closes, ok_l, sl_l, ic_l, ok_s, sl_s, ic_s, tolerance)
+
+
+# Warm the JIT cache at import so the first live scan doesn't pay
+# compile latency.
+# float32 is what the live agent feeds; float64 covers the backtester.
+for _dtype in (np.float32, np.float64):
+    _warm = np.array([1.0, 2.0, 1.0, 2.0, 1.0], _dtype)
+    _detect_both(_warm, _warm, _warm, 1, 0.003)
@@ -12,14 +12,19 @@ Starting balance is set via STARTING_BALANCE in your .env file.
 """
 from __future__ import annotations
 
-import csv
+import atexit
 import os
+import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
 from agents.market_analysis_agent import TradeSignal
 from agents.risk_management_agent import ApprovedTrade
 from config.settings import MAX_TRADES_PER_SESSION, STARTING_BALANCE, TRADES_DIR
@@ -30,10 +35,21 @@ logger = setup_logger(__name__)
 
 _NY = ZoneInfo("America/New_York")
 
+# Re-use a just-fetched price for this many seconds before hitting yfinance
+# again — scan cadence is usually well inside the 1-minute bar interval.
+_PRICE_TTL = 20.0
+
 
 # ── Internal position record ──────────────────────────────────────────────────
 
 @dataclass
+class AccountSnapshot:
+    cash: float
+    open_trades: int
+    daily_pnl: float
+
+
+@dataclass(slots=True)
 class Position:
     order_id: str
     symbol: str
@@ -61,8 +77,36 @@ class ExecutionAgent:
         self._cash: float = STARTING_BALANCE
         self._positions: Dict[str, Position] = {}   # order_id → Position
         self._realised_pnl_today: float = 0.0
+        self._unrealized_total: float = 0.0         # running Σ unrealized_pnl
         self._fetcher = DataFetcher()
         self._session_trades: Dict[str, int] = {}   # "NY_2026-02-26" → count
+        self._price_cache: Dict[str, Tuple[float, float]] = {}  # symbol → (price, epoch_ts)
+
+        # Dense parallel arrays mirroring self._positions so stop/target
+        # checks run as one vectorized pass instead of per-position scalars.
+        self._order_ids: List[str] = []            # dense index → order_id
+        self._pos_index: Dict[str, int] = {}       # order_id → dense index
+        self._entries = np.empty(0, np.float64)
+        self._stops   = np.empty(0, np.float64)
+        self._targets = np.empty(0, np.float64)
+        self._qtys    = np.empty(0, np.float64)
+        self._signs   = np.empty(0, np.float64)    # +1 long, -1 short
+
+        # One long-lived HTTP session for all price fetches: keep-alive +
+        # connection pooling instead of a fresh TLS handshake per request.
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=3, backoff_factor=0.1),
+        )
+        self._http.mount("https://", adapter)
+        try:
+            # Pre-warm TCP + TLS so the first monitor cycle doesn't pay
+            # the full connection-setup latency.
+            self._http.head("https://query1.finance.yahoo.com", timeout=5)
+        except Exception:
+            pass  # offline at startup is fine — fetches will retry later
 
         os.makedirs(TRADES_DIR, exist_ok=True)
         self._log_path = os.path.join(
@@ -114,18 +158,30 @@ class ExecutionAgent:
 
     # ── Account helpers ───────────────────────────────────────────────────────
 
+    def snapshot(self) -> AccountSnapshot:
+        """Return cash, open-trade count, and daily P&L in one read.
+
+        Preferred over the individual getters — the orchestrator needs all
+        three per signal, and a broker-backed agent can serve them from a
+        single account/positions round-trip.
+        """
+        return AccountSnapshot(
+            cash=self._cash,
+            open_trades=len(self._positions),
+            daily_pnl=self._realised_pnl_today + self._unrealized_total,
+        )
+
     def get_account_balance(self) -> float:
         """Return current cash balance."""
-        return self._cash
+        return self.snapshot().cash
 
     def get_open_trade_count(self) -> int:
         """Return number of currently open (simulated) positions."""
-        return len(self._positions)
+        return self.snapshot().open_trades
 
     def get_daily_pnl(self) -> float:
         """Return today's realised P&L plus unrealised P&L on open positions."""
-        unrealised = sum(p.unrealized_pnl for p in self._positions.values())
-        return self._realised_pnl_today + unrealised
+        return self.snapshot().daily_pnl
 
     # ── Order execution ───────────────────────────────────────────────────────
 
@@ -150,6 +206,7 @@ class ExecutionAgent:
         # Deduct cost from cash
         self._cash -= trade_value
 
+        now_iso = datetime.now(_NY).isoformat()
         order_id = str(uuid.uuid4())[:8]
         pos = Position(
             order_id=order_id,
@@ -159,9 +216,10 @@ class ExecutionAgent:
             entry_price=signal.entry_price,
             stop_loss=signal.stop_loss,
             take_profit=signal.take_profit,
-            entry_time=datetime.now(_NY).isoformat(),
+            entry_time=now_iso,
         )
         self._positions[order_id] = pos
+        self._append_position_arrays(pos)
 
         logger.info(
             f"SIMULATED FILL  [{signal.signal_type}] {signal.symbol} "
@@ -173,12 +231,39 @@ class ExecutionAgent:
             approved=approved,
             order_id=order_id,
             status="FILLED (simulated)",
+            now_iso=now_iso,
         )
         self._record_session_trade()
         return pos
 
     # ── Position monitoring & exit management ─────────────────────────────────
 
+    def _append_position_arrays(self, pos: Position) -> None:
+        self._pos_index[pos.order_id] = len(self._order_ids)
+        self._order_ids.append(pos.order_id)
+        self._entries = np.append(self._entries, pos.entry_price)
+        self._stops   = np.append(self._stops, pos.stop_loss)
+        self._targets = np.append(self._targets, pos.take_profit)
+        self._qtys    = np.append(self._qtys, pos.qty)
+        self._signs   = np.append(self._signs, 1.0 if pos.side == "BUY" else -1.0)
+
+    def _remove_position_arrays(self, order_id: str) -> None:
+        """Swap-with-last removal keeps the arrays dense."""
+        i = self._pos_index.pop(order_id)
+        last = len(self._order_ids) - 1
+        if i != last:
+            moved = self._order_ids[last]
+            self._order_ids[i] = moved
+            self._pos_index[moved] = i
+            for arr in (self._entries, self._stops, self._targets, self._qtys, self._signs):
+                arr[i] = arr[last]
+        self._order_ids.pop()
+        self._entries = self._entries[:-1]
+        self._stops   = self._stops[:-1]
+        self._targets = self._targets[:-1]
+        self._qtys    = self._qtys[:-1]
+        self._signs   = self._signs[:-1]
+
     def monitor_positions(self) -> None:
         """
         Check each open position against its stop-loss and take-profit.
@@ -189,22 +274,34 @@ class ExecutionAgent:
             logger.debug("No open positions to monitor.")
             return
 
-        to_close: List[str] = []
+        # One batched download covers every open symbol in a single HTTP call.
+        per_pos_symbols = [self._positions[oid].symbol for oid in self._order_ids]
+        prices = self._get_current_prices(sorted(set(per_pos_symbols)))
+
+        # One timestamp per tick — every exit this cycle shares it.
+        now_iso = datetime.now(_NY).isoformat()
 
-        for oid, pos in self._positions.items():
-            current_price = self._get_current_price(pos.symbol)
-            if current_price is None:
+        # Vectorized P&L + stop/target tests over the dense position arrays.
+        price_arr = np.array(
+            [prices.get(sym, np.nan) for sym in per_pos_symbols], dtype=np.float64
+        )
+        valid = ~np.isnan(price_arr)
+        pnl_arr = self._signs * (price_arr - self._entries) * self._qtys
+        hit_stop = valid & (self._signs * (price_arr - self._stops) <= 0.0)
+        hit_target = valid & ~hit_stop & (self._signs * (price_arr - self._targets) >= 0.0)
+
+        to_close: List[Tuple[str, float, str]] = []
+        # Rebuilt as we walk the positions; replaces per-call O(N) sums.
+        new_unrealized = 0.0
+
+        for i, oid in enumerate(self._order_ids):
+            pos = self._positions[oid]
+            if not valid[i]:
+                new_unrealized += pos.unrealized_pnl   # keep stale value counted
                 continue
 
-            # Update unrealised P&L
-            if pos.side == "BUY":
-                pos.unrealized_pnl = (current_price - pos.entry_price) * pos.qty
-                hit_stop   = current_price <= pos.stop_loss
-                hit_target = current_price >= pos.take_profit
-            else:  # SELL (short)
-                pos.unrealized_pnl = (pos.entry_price - current_price) * pos.qty
-                hit_stop   = current_price >= pos.stop_loss
-                hit_target = current_price <= pos.take_profit
+            pos.unrealized_pnl = float(pnl_arr[i])
+            current_price = float(price_arr[i])
 
             sign = "+" if pos.unrealized_pnl >= 0 else ""
             logger.info(
@@ -213,26 +310,34 @@ class ExecutionAgent:
                 f"P&L: {sign}{pos.unrealized_pnl:.2f}"
             )
 
-            if hit_stop:
+            if hit_stop[i]:
                 logger.info(f"  → STOP-LOSS triggered for {pos.symbol} @ {current_price:.2f}")
-                self._close_position(oid, current_price, reason="STOP-LOSS")
-                to_close.append(oid)
-            elif hit_target:
+                to_close.append((oid, current_price, "STOP-LOSS"))
+            elif hit_target[i]:
                 logger.info(f"  → TAKE-PROFIT triggered for {pos.symbol} @ {current_price:.2f}")
-                self._close_position(oid, current_price, reason="TAKE-PROFIT")
-                to_close.append(oid)
+                to_close.append((oid, current_price, "TAKE-PROFIT"))
+            else:
+                new_unrealized += pos.unrealized_pnl
 
-        for oid in to_close:
+        for oid, exit_price, reason in to_close:
+            self._close_position(oid, exit_price, reason=reason, now_iso=now_iso)
             del self._positions[oid]
+            self._remove_position_arrays(oid)
+        self._unrealized_total = new_unrealized
 
         logger.info(
             f"Account  cash=${self._cash:,.2f}  "
             f"open={len(self._positions)}  "
             f"daily P&L=${self.get_daily_pnl():+.2f}"
         )
+        self.flush_logs()
 
-    def _close_position(self, order_id: str, exit_price: float, reason: str) -> None:
+    def _close_position(
+        self, order_id: str, exit_price: float, reason: str, now_iso: Optional[str] = None
+    ) -> None:
         pos = self._positions[order_id]
+        if now_iso is None:
+            now_iso = datetime.now(_NY).isoformat()
 
         if pos.side == "BUY":
             pnl = (exit_price - pos.entry_price) * pos.qty
@@ -243,6 +348,7 @@ class ExecutionAgent:
 
         self._cash += proceeds
         self._realised_pnl_today += pnl
+        self._unrealized_total -= pos.unrealized_pnl
 
         logger.info(
             f"CLOSED {pos.symbol} [{reason}]  "
@@ -250,19 +356,57 @@ class ExecutionAgent:
             f"P&L: {pnl:+.2f}  cash=${self._cash:,.2f}"
         )
 
-        self._log_exit(pos, exit_price=exit_price, pnl=pnl, reason=reason)
+        self._log_exit(pos, exit_price=exit_price, pnl=pnl, reason=reason, now_iso=now_iso)
 
-    def _get_current_price(self, symbol: str) -> Optional[float]:
-        """Fetch the latest close price for a symbol."""
+    def _get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch the latest close price for each symbol in one yfinance call.
+
+        Prices fetched within the last _PRICE_TTL seconds are served from
+        an in-memory cache instead of re-hitting yfinance.
+        """
+        now = time.time()
+        prices: Dict[str, float] = {
+            sym: price
+            for sym, (price, ts) in self._price_cache.items()
+            if sym in symbols and now - ts < _PRICE_TTL
+        }
+        symbols = [s for s in symbols if s not in prices]
+        if not symbols:
+            return prices
         try:
             import yfinance as yf
-            data = yf.Ticker(symbol).history(period="1d", interval="1m")
-            if data.empty:
-                return None
-            return float(data["Close"].iloc[-1])
+            data = yf.download(
+                tickers=" ".join(symbols),
+                period="1d",
+                interval="1m",
+                group_by="ticker",
+                threads=True,
+                progress=False,
+                session=self._http,
+            )
         except Exception as exc:
-            logger.error(f"Could not fetch current price for {symbol}: {exc}")
-            return None
+            logger.error(f"Could not fetch current prices for {symbols}: {exc}")
+            return prices
+
+        for sym in symbols:
+            try:
+                # group_by="ticker" returns (Ticker, Price) columns even for a
+                # single symbol on current yfinance, so select by symbol first.
+                try:
+                    closes = data[sym]["Close"]
+                except KeyError:    # older yfinance squeezed single-ticker frames
+                    closes = data["Close"]
+                closes = closes.dropna()
+                if not closes.empty:
+                    prices[sym] = float(closes.iloc[-1])
+                    self._price_cache[sym] = (prices[sym], now)
+            except Exception:
+                logger.warning(f"No current price in batch response for {sym}")
+        return prices
+
+    def _get_current_price(self, symbol: str) -> Optional[float]:
+        """Single-symbol fallback around the batched fetcher."""
+        return self._get_current_prices([symbol]).get(symbol)
 
     # ── Trade journal (CSV) ───────────────────────────────────────────────────
 
@@ -276,43 +420,75 @@ class ExecutionAgent:
         "entry_price", "exit_price", "pnl", "exit_reason",
     ]
 
-    def _init_log(self) -> None:
-        if not os.path.exists(self._log_path):
-            with open(self._log_path, "w", newline="") as fh:
-                csv.writer(fh).writerow(self._ENTRY_HEADERS)
+    # Every field is numeric or controlled text (sanitized of commas and
+    # newlines), so rows are pre-formatted and written as bytes — no
+    # per-field csv.writer dialect dispatch.
+    _ENTRY_FMT = "{ts},{oid},{sym},{side},{qty},{ep},{sl},{tp},{dr},{conf},{reason},{status}\n"
+    _EXIT_FMT = "{ts},{oid},{sym},{side},{qty},{ep},{xp},{pnl},{reason}\n"
+
+    @staticmethod
+    def _sanitize(text: str) -> str:
+        return text.replace(",", ";").replace("\n", " ")
 
-    def _log_trade(self, approved: ApprovedTrade, order_id: str, status: str) -> None:
+    def _init_log(self) -> None:
+        """Open a single long-lived, buffered handle per journal file."""
+        write_header = not os.path.exists(self._log_path)
+        self._log_fh = open(self._log_path, "ab", buffering=1 << 16)
+        if write_header:
+            self._log_fh.write((",".join(self._ENTRY_HEADERS) + "\n").encode())
+            self._log_fh.flush()
+
+        self._exit_fh = None       # opened lazily on the first exit
+        atexit.register(self._close_logs)
+
+    def _close_logs(self) -> None:
+        for fh in (self._log_fh, self._exit_fh):
+            if fh is not None and not fh.closed:
+                fh.close()
+
+    def flush_logs(self) -> None:
+        """Push buffered journal rows to disk (called once per scan cycle)."""
+        for fh in (self._log_fh, self._exit_fh):
+            if fh is not None and not fh.closed:
+                fh.flush()
+
+    def _log_trade(
+        self, approved: ApprovedTrade, order_id: str, status: str, now_iso: str
+    ) -> None:
         sig = approved.signal
-        row = [
-            datetime.now(_NY).isoformat(), order_id,
-            sig.symbol, sig.signal_type, approved.position_size,
-            sig.entry_price, sig.stop_loss, sig.take_profit,
-            approved.dollar_risk, sig.confidence, sig.reason, status,
-        ]
+        row = self._ENTRY_FMT.format(
+            ts=now_iso, oid=order_id,
+            sym=sig.symbol, side=sig.signal_type, qty=approved.position_size,
+            ep=sig.entry_price, sl=sig.stop_loss, tp=sig.take_profit,
+            dr=approved.dollar_risk, conf=sig.confidence,
+            reason=self._sanitize(sig.reason), status=status,
+        )
         self._append_row(row)
 
-    def _log_exit(self, pos: Position, exit_price: float, pnl: float, reason: str) -> None:
-        exit_log = os.path.join(
-            TRADES_DIR,
-            f"exits_{datetime.now().strftime('%Y-%m-%d')}.csv",
-        )
-        write_header = not os.path.exists(exit_log)
+    def _log_exit(
+        self, pos: Position, exit_price: float, pnl: float, reason: str, now_iso: str
+    ) -> None:
         try:
-            with open(exit_log, "a", newline="") as fh:
-                w = csv.writer(fh)
+            if self._exit_fh is None:
+                exit_log = os.path.join(
+                    TRADES_DIR,
+                    f"exits_{datetime.now().strftime('%Y-%m-%d')}.csv",
+                )
+                write_header = not os.path.exists(exit_log)
+                self._exit_fh = open(exit_log, "ab", buffering=1 << 16)
                 if write_header:
-                    w.writerow(self._EXIT_HEADERS)
-                w.writerow([
-                    datetime.now(_NY).isoformat(), pos.order_id,
-                    pos.symbol, pos.side, pos.qty,
-                    pos.entry_price, exit_price, round(pnl, 2), reason,
-                ])
+                    self._exit_fh.write((",".join(self._EXIT_HEADERS) + "\n").encode())
+            self._exit_fh.write(self._EXIT_FMT.format(
+                ts=now_iso, oid=pos.order_id,
+                sym=pos.symbol, side=pos.side, qty=pos.qty,
+                ep=pos.entry_price, xp=exit_price, pnl=round(pnl, 2),
+                reason=reason,
+            ).encode())
         except Exception as exc:
             logger.error(f"Failed to write exit log: {exc}")
 
-    def _append_row(self, row: list) -> None:
+    def _append_row(self, row: str) -> None:
         try:
-            with open(self._log_path, "a", newline="") as fh:
-                csv.writer(fh).writerow(row)
+            self._log_fh.write(row.encode())
         except Exception as exc:
             logger.error(f"Failed to write trade log: {exc}")
@@ -28,6 +28,13 @@ from zoneinfo import ZoneInfo
 import numpy as np
 import pandas as pd
 
+try:
+    # C-implemented O(n) running extremes — cost independent of window size.
+    from scipy.ndimage import maximum_filter1d, minimum_filter1d
+except ImportError:  # scipy is optional
+    maximum_filter1d = minimum_filter1d = None
+
+from agents._signal_kernel import _detect_pair, _trendlines
 from config.settings import LOOKBACK_BARS, RETRACEMENT_TOLERANCE, SWING_LOOKBACK
 from utils.data_fetcher import DataFetcher
 from utils.logger import setup_logger
@@ -62,12 +69,23 @@ class MarketAnalysisAgent:
 
     def __init__(self) -> None:
         self._fetcher = DataFetcher()
+        # symbol → (last_bar_ts, fitted trendline params). Swing structure
+        # only moves when a new bar closes, so the expensive swing-scan +
+        # line-fit half of the detector is reused for intrabar re-scans.
+        self._ta_cache: Dict[str, Tuple[str, tuple]] = {}
 
     def scan_symbols(self, symbols: List[str]) -> List[TradeSignal]:
-        """Return all valid trade signals across the provided symbols."""
+        """Return all valid trade signals across the provided symbols.
+
+        Bars for the whole watchlist are fetched in one batched download,
+        so a scan costs a single HTTP round-trip regardless of list size.
+        """
+        if not symbols:
+            return []
+        bars = self._fetcher.get_bars_multi(symbols, limit=LOOKBACK_BARS)
         signals: List[TradeSignal] = []
         for sym in symbols:
-            sig = self._analyze(sym)
+            sig = self._analyze_df(sym, bars.get(sym))
             if sig:
                 signals.append(sig)
         return signals
@@ -75,177 +93,53 @@ class MarketAnalysisAgent:
     # ── Core analysis ─────────────────────────────────────────────────────────
 
     def _analyze(self, symbol: str) -> Optional[TradeSignal]:
-        df = self._fetcher.get_bars(symbol, limit=LOOKBACK_BARS)
+        return self._analyze_df(symbol, self._fetcher.get_bars(symbol, limit=LOOKBACK_BARS))
+
+    def _analyze_df(self, symbol: str, df: Optional[pd.DataFrame]) -> Optional[TradeSignal]:
         if df is None or len(df) < 30:
             logger.debug(f"{symbol}: insufficient data ({0 if df is None else len(df)} bars)")
             return None
 
-        sig = self._check_long_setup(symbol, df)
-        if sig:
-            return sig
-        return self._check_short_setup(symbol, df)
-
-    # ── Long setup ────────────────────────────────────────────────────────────
-
-    def _check_long_setup(self, symbol: str, df: pd.DataFrame) -> Optional[TradeSignal]:
-        """
-        Downtrend trendline → price breaks above → retraces → bounces → BUY.
-        """
-        highs  = df["high"].values
-        lows   = df["low"].values
-        closes = df["close"].values
-        n = len(df)
-
-        # 1. Find swing highs and fit downtrend line
-        sh_idx = _swing_points(highs, SWING_LOOKBACK, is_high=True)
-        if len(sh_idx) < 2:
-            return None
-
-        slope, intercept = _fit_line(sh_idx[-3:], highs[sh_idx[-3:]])
-        if slope is None or slope >= 0:
-            return None  # Need a negative slope (downtrend)
-
-        # 2. Find a breakout candle (close crosses above trendline) in last 1–10 bars
-        breakout_bar: Optional[int] = None
-        for lookback in range(1, min(11, n)):
-            i_prev = n - 1 - lookback
-            i_curr = n - lookback
-            tl_prev = slope * i_prev + intercept
-            tl_curr = slope * i_curr + intercept
-            if closes[i_prev] < tl_prev and closes[i_curr] >= tl_curr:
-                breakout_bar = i_curr
-                break
-
-        if breakout_bar is None:
-            return None
-
-        bars_since = (n - 1) - breakout_bar
-        if bars_since < 1:
-            return None  # Need at least 1 bar after the break
-
-        # 3. Breakout high = highest high from breakout bar to now
-        breakout_high = float(highs[breakout_bar:].max())
-
-        # 4. Retracement check — lowest low since break must touch trendline zone
-        tl_now = slope * (n - 1) + intercept
-        retest_zone_top = tl_now * (1.0 + RETRACEMENT_TOLERANCE)
-        retest_low = float(lows[breakout_bar:].min())
-
-        if retest_low > retest_zone_top:
-            return None  # Never pulled back to trendline
-
-        # 5. Current close must be above trendline (bounce confirmed)
-        current_close = float(closes[-1])
-        if current_close < tl_now * (1.0 - RETRACEMENT_TOLERANCE):
-            return None  # Closed back below trendline — setup invalidated
-
-        # 6. Build signal
-        entry  = current_close
-        stop   = round(retest_low * (1.0 - 0.002), 2)   # 0.2% below retest low
-        target = round(breakout_high, 2)
-
-        risk   = entry - stop
-        reward = target - entry
-        if risk <= 0 or reward <= 0:
-            return None
-
-        rr = reward / risk
-        confidence = _confidence(rr, bars_since)
+        # Materialize pandas → NumPy once; both setup directions share the
+        # arrays inside a single kernel call (long tried first, then short).
+        # float32 halves the bytes the kernel streams — plenty of precision
+        # for 4–5 significant-digit prices.
+        arr = df[["high", "low", "close"]].to_numpy(dtype=np.float32)
+        highs, lows, closes = arr[:, 0], arr[:, 1], arr[:, 2]
+
+        bar_ts = str(df.index[-1])
+        cached = self._ta_cache.get(symbol)
+        if cached is not None and cached[0] == bar_ts:
+            lines = cached[1]
+        else:
+            lines = _trendlines(highs, lows, SWING_LOOKBACK)
+            self._ta_cache[symbol] = (bar_ts, lines)
 
-        logger.info(
-            f"{symbol} LONG  entry={entry:.2f}  stop={stop:.2f}  "
-            f"target={target:.2f}  R:R={rr:.1f}  conf={confidence:.0%}"
-        )
-        return TradeSignal(
-            symbol=symbol,
-            signal_type="BUY",
-            entry_price=round(entry, 2),
-            stop_loss=stop,
-            take_profit=target,
-            confidence=confidence,
-            timestamp=datetime.now(_NY).isoformat(),
-            reason=(
-                f"Downtrend trendline break-and-retest | "
-                f"R:R {rr:.1f}:1 | {bars_since} bars post-break"
-            ),
+        direction, entry, stop, target, bars_since, rr = _detect_pair(
+            highs, lows, closes, *lines, RETRACEMENT_TOLERANCE
         )
-
-    # ── Short setup ───────────────────────────────────────────────────────────
-
-    def _check_short_setup(self, symbol: str, df: pd.DataFrame) -> Optional[TradeSignal]:
-        """
-        Uptrend trendline → price breaks below → retraces → rejection → SELL.
-        """
-        highs  = df["high"].values
-        lows   = df["low"].values
-        closes = df["close"].values
-        n = len(df)
-
-        sl_idx = _swing_points(lows, SWING_LOOKBACK, is_high=False)
-        if len(sl_idx) < 2:
-            return None
-
-        slope, intercept = _fit_line(sl_idx[-3:], lows[sl_idx[-3:]])
-        if slope is None or slope <= 0:
-            return None  # Need positive slope (uptrend)
-
-        breakdown_bar: Optional[int] = None
-        for lookback in range(1, min(11, n)):
-            i_prev = n - 1 - lookback
-            i_curr = n - lookback
-            tl_prev = slope * i_prev + intercept
-            tl_curr = slope * i_curr + intercept
-            if closes[i_prev] > tl_prev and closes[i_curr] <= tl_curr:
-                breakdown_bar = i_curr
-                break
-
-        if breakdown_bar is None:
-            return None
-
-        bars_since = (n - 1) - breakdown_bar
-        if bars_since < 1:
+        if direction == 0:
             return None
 
-        breakdown_low = float(lows[breakdown_bar:].min())
-
-        tl_now = slope * (n - 1) + intercept
-        retest_zone_bot = tl_now * (1.0 - RETRACEMENT_TOLERANCE)
-        retest_high = float(highs[breakdown_bar:].max())
-
-        if retest_high < retest_zone_bot:
-            return None  # Never pulled back to trendline
-
-        current_close = float(closes[-1])
-        if current_close > tl_now * (1.0 + RETRACEMENT_TOLERANCE):
-            return None  # Closed back above trendline — invalidated
-
-        entry  = current_close
-        stop   = round(retest_high * (1.0 + 0.002), 2)
-        target = round(breakdown_low, 2)
-
-        risk   = stop - entry
-        reward = entry - target
-        if risk <= 0 or reward <= 0:
-            return None
-
-        rr = reward / risk
         confidence = _confidence(rr, bars_since)
+        is_long = direction > 0
 
         logger.info(
-            f"{symbol} SHORT entry={entry:.2f}  stop={stop:.2f}  "
+            f"{symbol} {'LONG ' if is_long else 'SHORT'} "
+            f"entry={entry:.2f}  stop={stop:.2f}  "
             f"target={target:.2f}  R:R={rr:.1f}  conf={confidence:.0%}"
         )
         return TradeSignal(
             symbol=symbol,
-            signal_type="SELL",
-            entry_price=round(entry, 2),
-            stop_loss=stop,
-            take_profit=target,
+            signal_type="BUY" if is_long else "SELL",
+            entry_price=round(float(entry), 2),
+            stop_loss=round(float(stop), 2),
+            take_profit=round(float(target), 2),
             confidence=confidence,
             timestamp=datetime.now(_NY).isoformat(),
             reason=(
-                f"Uptrend trendline break-and-retest | "
-                f"R:R {rr:.1f}:1 | {bars_since} bars post-break"
+                f"{'Downtrend' if is_long else 'Uptrend'} trendline "
+                f"break-and-retest | R:R {rr:.1f}:1 | {bars_since} bars post-break"
             ),
         )
 
@@ -259,24 +153,29 @@ def _swing_points(prices: np.ndarray, lookback: int, is_high: bool) -> List[int]
     [i-lookback … i+lookback] AND is strictly higher/lower than both neighbours.
     """
     n = len(prices)
-    result: List[int] = []
-    for i in range(lookback, n - lookback):
-        window = prices[i - lookback : i + lookback + 1]
-        if is_high:
-            if (
-                prices[i] == window.max()
-                and prices[i] > prices[i - 1]
-                and prices[i] > prices[i + 1]
-            ):
-                result.append(i)
-        else:
-            if (
-                prices[i] == window.min()
-                and prices[i] < prices[i - 1]
-                and prices[i] < prices[i + 1]
-            ):
-                result.append(i)
-    return result
+    if n < 2 * lookback + 1:
+        return []
+
+    # Rolling extreme over each [i-lookback … i+lookback] window. The scipy
+    # running filter is O(n) regardless of window size; otherwise fall back
+    # to one strided (n-2·lookback, 2·lookback+1) view reduction.
+    if maximum_filter1d is not None:
+        filt = maximum_filter1d if is_high else minimum_filter1d
+        extreme = filt(prices, size=2 * lookback + 1)[lookback : n - lookback]
+    else:
+        windows = np.lib.stride_tricks.sliding_window_view(prices, 2 * lookback + 1)
+        extreme = windows.max(axis=1) if is_high else windows.min(axis=1)
+
+    center = prices[lookback : n - lookback]
+    prev_  = prices[lookback - 1 : n - lookback - 1]
+    next_  = prices[lookback + 1 : n - lookback + 1]
+
+    if is_high:
+        mask = (center == extreme) & (center > prev_) & (center > next_)
+    else:
+        mask = (center == extreme) & (center < prev_) & (center < next_)
+
+    return (np.flatnonzero(mask) + lookback).tolist()
 
 
 def _fit_line(
@@ -285,13 +184,18 @@ def _fit_line(
     """Linear regression through (index, price) pairs → (slope, intercept)."""
     if len(indices) < 2:
         return None, None
-    try:
-        x = np.array(indices, dtype=float)
-        y = np.array(prices, dtype=float)
-        slope, intercept = np.polyfit(x, y, 1)
-        return float(slope), float(intercept)
-    except Exception:
+    # Closed-form least squares — np.polyfit's Vandermonde + lstsq machinery
+    # is massive overkill for a degree-1 fit through ≤3 points.
+    x = np.asarray(indices, dtype=float)
+    y = np.asarray(prices, dtype=float)
+    xm = x.mean()
+    ym = y.mean()
+    dx = x - xm
+    denom = float((dx * dx).sum())
+    if denom == 0.0:
         return None, None
+    slope = float((dx * (y - ym)).sum() / denom)
+    return slope, ym - slope * xm
 
 
 def _confidence(rr: float, bars_since_breakout: int) -> float:
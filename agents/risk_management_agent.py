@@ -31,7 +31,7 @@ logger = setup_logger(__name__)
 
 # ── Public data structure ─────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class ApprovedTrade:
     signal: TradeSignal
     position_size: int        # Number of shares to trade
@@ -68,46 +68,57 @@ class RiskManagementAgent:
         Returns:
             ApprovedTrade — check .approved before executing.
         """
+        # Local aliases — resolved once with LOAD_FAST instead of a module
+        # dict lookup per use below.
+        min_rr     = MIN_RISK_REWARD
+        max_open   = MAX_OPEN_TRADES
+        max_dd_pct = MAX_DAILY_LOSS_PCT
+        fixed_risk = DOLLAR_RISK_PER_TRADE
+
+        # Risk per share and R:R, computed once up front — rule 1 and the
+        # sizing in rule 4 share the same numbers.
+        risk_per_share = abs(signal.entry_price - signal.stop_loss)
+        reward         = abs(signal.take_profit - signal.entry_price)
+        rr             = reward / risk_per_share if risk_per_share > 0 else 0.0
+
         # ── Rule 1: Minimum risk-reward ───────────────────────────────────────
-        rr = _risk_reward(signal)
-        if rr < MIN_RISK_REWARD:
+        if rr < min_rr:
             return _reject(
                 signal, account_balance,
-                f"R:R {rr:.2f} is below the minimum {MIN_RISK_REWARD:.1f}",
+                f"R:R {rr:.2f} is below the minimum {min_rr:.1f}",
             )
 
         # ── Rule 2: Maximum open positions ────────────────────────────────────
-        if open_trade_count >= MAX_OPEN_TRADES:
+        if open_trade_count >= max_open:
             return _reject(
                 signal, account_balance,
-                f"Max open trades reached ({open_trade_count}/{MAX_OPEN_TRADES})",
+                f"Max open trades reached ({open_trade_count}/{max_open})",
             )
 
         # ── Rule 3: Daily loss limit ──────────────────────────────────────────
         if account_balance > 0 and daily_pnl < 0:
             loss_pct = abs(daily_pnl) / account_balance
-            if loss_pct >= MAX_DAILY_LOSS_PCT:
+            if loss_pct >= max_dd_pct:
                 return _reject(
                     signal, account_balance,
                     f"Daily loss limit hit: {loss_pct:.1%} lost "
-                    f"(limit {MAX_DAILY_LOSS_PCT:.0%})",
+                    f"(limit {max_dd_pct:.0%})",
                 )
 
         # ── Rule 4: Position sizing (fixed $270 risk per trade) ───────────────
-        risk_per_share = abs(signal.entry_price - signal.stop_loss)
         if risk_per_share <= 0:
             return _reject(
                 signal, account_balance,
                 "Invalid stop loss — risk per share is zero or negative",
             )
 
-        position_size = int(DOLLAR_RISK_PER_TRADE / risk_per_share)
+        position_size = int(fixed_risk / risk_per_share)
 
         if position_size < 1:
             return _reject(
                 signal, account_balance,
                 f"Position size rounds to 0 "
-                f"(${DOLLAR_RISK_PER_TRADE:.2f} risk / ${risk_per_share:.4f}/share)",
+                f"(${fixed_risk:.2f} risk / ${risk_per_share:.4f}/share)",
             )
 
         # ── Rule 5: Trade-value cap (95 % of cash) ────────────────────────────
@@ -123,7 +134,7 @@ class RiskManagementAgent:
 
         logger.info(
             f"APPROVED {signal.symbol}: {position_size} shares | "
-            f"risk ${actual_risk:.2f} (fixed ${DOLLAR_RISK_PER_TRADE:.0f}/trade) | "
+            f"risk ${actual_risk:.2f} (fixed ${fixed_risk:.0f}/trade) | "
             f"R:R {rr:.1f}:1"
         )
         return ApprovedTrade(
@@ -137,12 +148,6 @@ class RiskManagementAgent:
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def _risk_reward(signal: TradeSignal) -> float:
-    risk   = abs(signal.entry_price - signal.stop_loss)
-    reward = abs(signal.take_profit - signal.entry_price)
-    return reward / risk if risk > 0 else 0.0
-
-
 def _reject(signal: TradeSignal, balance: float, reason: str) -> ApprovedTrade:
     logger.info(f"REJECTED {signal.symbol}: {reason}")
     return ApprovedTrade(
@@ -17,14 +17,16 @@ Results are printed to the console AND saved to:
 import argparse
 import csv
 import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import List, Optional
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
 
+from agents._signal_kernel import _fit_line_nb, _swing_idx, njit
 from agents.market_analysis_agent import (
     TradeSignal,
     _confidence,
@@ -42,6 +44,7 @@ from config.settings import (
     SYMBOLS,
     TRADES_DIR,
 )
+from utils.bar_cache import load_bars, store_bars
 from utils.logger import setup_logger
 
 logger = setup_logger("backtest")
@@ -49,7 +52,7 @@ logger = setup_logger("backtest")
 
 # ── Data structures ───────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class BacktestTrade:
     symbol: str
     side: str
@@ -63,12 +66,39 @@ class BacktestTrade:
     exit_reason: str   # "TAKE-PROFIT" | "STOP-LOSS" | "END-OF-DATA"
     confidence: float
     rr_ratio: float
+    tp: float = 0.0    # take-profit level while the trade is open
 
 
-@dataclass
+@dataclass(slots=True)
 class BacktestResult:
     symbol: str
     trades: List[BacktestTrade] = field(default_factory=list)
+    # (n_wins, n_losses, gross_win, gross_loss, max_dd) + the trade count
+    # it was computed for — every aggregate below reads from one shared pass.
+    _agg: tuple = field(default=(), repr=False)
+    _agg_len: int = field(default=-1, repr=False)
+
+    def _aggregate(self) -> tuple:
+        """One pass over the trades, recomputed only when the list grows."""
+        if self._agg_len != len(self.trades):
+            n_wins = n_losses = 0
+            gross_win = gross_loss = 0.0
+            equity = STARTING_BALANCE
+            peak   = equity
+            max_dd = 0.0
+            for t in self.trades:
+                if t.pnl > 0:
+                    n_wins += 1
+                    gross_win += t.pnl
+                else:
+                    n_losses += 1
+                    gross_loss += t.pnl
+                equity += t.pnl
+                peak    = max(peak, equity)
+                max_dd  = max(max_dd, peak - equity)
+            self._agg = (n_wins, n_losses, gross_win, gross_loss, max_dd)
+            self._agg_len = len(self.trades)
+        return self._agg
 
     @property
     def total_trades(self): return len(self.trades)
@@ -77,246 +107,497 @@ class BacktestResult:
     @property
     def losses(self): return [t for t in self.trades if t.pnl <= 0]
     @property
-    def win_rate(self): return len(self.wins) / self.total_trades if self.trades else 0
+    def win_rate(self):
+        return self._aggregate()[0] / self.total_trades if self.trades else 0
     @property
-    def total_pnl(self): return sum(t.pnl for t in self.trades)
+    def total_pnl(self):
+        agg = self._aggregate()
+        return agg[2] + agg[3]
     @property
-    def avg_win(self): return sum(t.pnl for t in self.wins) / len(self.wins) if self.wins else 0
+    def avg_win(self):
+        n_wins, _, gross_win, _, _ = self._aggregate()
+        return gross_win / n_wins if n_wins else 0
     @property
-    def avg_loss(self): return sum(t.pnl for t in self.losses) / len(self.losses) if self.losses else 0
+    def avg_loss(self):
+        _, n_losses, _, gross_loss, _ = self._aggregate()
+        return gross_loss / n_losses if n_losses else 0
     @property
     def profit_factor(self):
-        gross_win  = sum(t.pnl for t in self.wins)
-        gross_loss = abs(sum(t.pnl for t in self.losses))
-        return gross_win / gross_loss if gross_loss > 0 else float("inf")
+        _, _, gross_win, gross_loss, _ = self._aggregate()
+        return gross_win / abs(gross_loss) if gross_loss < 0 else float("inf")
     @property
     def max_drawdown(self):
-        if not self.trades: return 0.0
-        equity = STARTING_BALANCE
-        peak   = equity
-        max_dd = 0.0
-        for t in self.trades:
-            equity += t.pnl
-            peak    = max(peak, equity)
-            max_dd  = max(max_dd, peak - equity)
-        return max_dd
+        return self._aggregate()[4] if self.trades else 0.0
 
 
 # ── Data fetching ─────────────────────────────────────────────────────────────
 
-def fetch_history(symbol: str, days: int) -> Optional[pd.DataFrame]:
+def fetch_history(symbol: str, days: int, use_cache: bool = True) -> Optional[pd.DataFrame]:
     """Download daily bars for a longer lookback, then return 5-min bars."""
+    # yfinance: 5m data available up to 60 days; use 1d for longer periods
+    interval = "5m" if days <= 58 else "1d"
+    if use_cache:
+        cached = load_bars(symbol, days, interval)
+        if cached is not None:
+            return cached
+    import yfinance as yf   # deferred — pool workers never fetch
+
     try:
         end   = datetime.now()
         start = end - timedelta(days=days + 10)
         ticker = yf.Ticker(symbol)
-        # yfinance: 5m data available up to 60 days; use 1d for longer periods
-        if days <= 58:
-            df = ticker.history(start=start, end=end, interval="5m")
-        else:
-            df = ticker.history(start=start, end=end, interval="1d")
+        if interval == "1d":
             logger.info(f"{symbol}: using daily bars (>60 day window)")
+        df = ticker.history(start=start, end=end, interval=interval)
         if df is None or df.empty:
             return None
         df.columns = [c.lower() for c in df.columns]
         df = df[["open","high","low","close","volume"]].sort_index()
+        if use_cache:
+            store_bars(symbol, days, interval, df)
         return df
     except Exception as e:
         logger.error(f"fetch_history({symbol}): {e}")
         return None
 
 
+def fetch_history_many(symbols: List[str], days: int, use_cache: bool = True) -> dict:
+    """Download history for all symbols in one batched yfinance call.
+
+    One threaded multi-ticker download replaces a serial HTTPS round-trip
+    per symbol; symbols already in today's disk cache skip the network
+    entirely. Returns {symbol: DataFrame}; symbols with no data are omitted.
+    """
+    interval = "5m" if days <= 58 else "1d"
+
+    out = {}
+    missing = list(symbols)
+    if use_cache:
+        missing = []
+        for sym in symbols:
+            cached = load_bars(sym, days, interval)
+            if cached is not None:
+                out[sym] = cached
+            else:
+                missing.append(sym)
+    if not missing:
+        return out
+
+    import yfinance as yf   # deferred — pool workers never fetch
+
+    end   = datetime.now()
+    start = end - timedelta(days=days + 10)
+    if interval == "1d":
+        logger.info(f"{', '.join(missing)}: using daily bars (>60 day window)")
+    try:
+        data = yf.download(
+            tickers=" ".join(missing),
+            start=start,
+            end=end,
+            interval=interval,
+            group_by="ticker",
+            threads=True,
+            progress=False,
+        )
+    except Exception as e:
+        logger.error(f"fetch_history_many({symbols}): {e}")
+        return out
+
+    for sym in missing:
+        try:
+            # group_by="ticker" returns (Ticker, Price) columns even for a
+            # single symbol on current yfinance — select by symbol, falling
+            # back to the squeezed frame older versions produced.
+            try:
+                df = data[sym]
+            except KeyError:
+                df = data if len(missing) == 1 else None
+        except Exception:
+            df = None
+        if df is None or df.empty:
+            continue
+        df = df.dropna(how="all")
+        if df.empty:
+            continue
+        df = df.copy()
+        df.columns = [c.lower() for c in df.columns]
+        df = df[["open", "high", "low", "close", "volume"]].sort_index()
+        if use_cache:
+            store_bars(sym, days, interval, df)
+        out[sym] = df
+    return out
+
+
 # ── Strategy replay ───────────────────────────────────────────────────────────
 
 def simulate_symbol(symbol: str, df: pd.DataFrame, balance: float) -> BacktestResult:
     """
     Walk forward through the bars, running the trendline strategy on each
-    rolling window and simulating fills / exits bar-by-bar.
+    rolling window and resolving fills / exits with vectorized scans.
+
+    Thin boundary wrapper: pandas stops here. The DataFrame is unpacked
+    into contiguous float64 buffers (transposed so each series is its own
+    cache-friendly run of memory) plus one vectorized strftime pass for
+    the date strings, and the replay itself runs on plain arrays.
     """
+    arr = np.ascontiguousarray(df[["high", "low", "close"]].to_numpy(np.float64).T)
+    bar_dates = df.index.strftime("%Y-%m-%d %H:%M:%S").to_numpy()
+    return simulate_arrays(symbol, arr[0], arr[1], arr[2], bar_dates, balance)
+
+
+def simulate_arrays(
+    symbol: str,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    bar_dates: np.ndarray,
+    balance: float,
+) -> BacktestResult:
+    """Run the strategy replay over raw OHLC arrays — no pandas anywhere."""
     result = BacktestResult(symbol=symbol)
-    closes = df["close"].values
-    highs  = df["high"].values
-    lows   = df["low"].values
-    n      = len(df)
+    n = closes.shape[0]
     open_trade: Optional[BacktestTrade] = None
 
-    for i in range(LOOKBACK_BARS, n):
-        window_close = closes[max(0, i - LOOKBACK_BARS): i]
-        window_high  = highs [max(0, i - LOOKBACK_BARS): i]
-        window_low   = lows  [max(0, i - LOOKBACK_BARS): i]
-
-        current_close = float(closes[i])
-        current_high  = float(highs[i])
-        current_low   = float(lows[i])
-        bar_date      = str(df.index[i])[:19]
-
-        # ── Check exit on open trade ──────────────────────────────────────
-        if open_trade:
-            if open_trade.side == "BUY":
-                if current_low <= open_trade.exit_price and open_trade.exit_reason == "STOP-LOSS":
-                    # stop hit
-                    pnl = (open_trade.exit_price - open_trade.entry_price) * open_trade.qty
-                    open_trade.pnl      = round(pnl, 2)
-                    open_trade.pnl_pct  = round(pnl / (open_trade.entry_price * open_trade.qty) * 100, 2)
-                    open_trade.exit_date = bar_date
-                    result.trades.append(open_trade)
-                    balance += open_trade.exit_price * open_trade.qty + pnl
-                    open_trade = None
-                elif current_high >= open_trade.exit_price and open_trade.exit_reason == "TAKE-PROFIT":
-                    pnl = (open_trade.exit_price - open_trade.entry_price) * open_trade.qty
-                    open_trade.pnl      = round(pnl, 2)
-                    open_trade.pnl_pct  = round(pnl / (open_trade.entry_price * open_trade.qty) * 100, 2)
-                    open_trade.exit_date = bar_date
-                    result.trades.append(open_trade)
-                    balance += open_trade.exit_price * open_trade.qty + pnl
-                    open_trade = None
-            else:  # SELL
-                if current_high >= open_trade.exit_price and open_trade.exit_reason == "STOP-LOSS":
-                    pnl = (open_trade.entry_price - open_trade.exit_price) * open_trade.qty
-                    open_trade.pnl      = round(pnl, 2)
-                    open_trade.pnl_pct  = round(pnl / (open_trade.entry_price * open_trade.qty) * 100, 2)
-                    open_trade.exit_date = bar_date
-                    result.trades.append(open_trade)
-                    open_trade = None
-                elif current_low <= open_trade.exit_price and open_trade.exit_reason == "TAKE-PROFIT":
-                    pnl = (open_trade.entry_price - open_trade.exit_price) * open_trade.qty
-                    open_trade.pnl      = round(pnl, 2)
-                    open_trade.pnl_pct  = round(pnl / (open_trade.entry_price * open_trade.qty) * 100, 2)
-                    open_trade.exit_date = bar_date
-                    result.trades.append(open_trade)
-                    open_trade = None
-            continue  # don't look for new entry while in a trade
+    # Swing structure for the whole series, computed once — each bar then
+    # picks its last ≤3 visible swings with two binary searches instead of
+    # rescanning an overlapping window (O(n·W) → O(n + S)).
+    sh_all = _swing_idx(highs, SWING_LOOKBACK, True)
+    sl_all = _swing_idx(lows, SWING_LOOKBACK, False)
 
-        # ── Look for new entry ────────────────────────────────────────────
-        signal = _detect_long(window_close, window_high, window_low)
-        if signal is None:
-            signal = _detect_short(window_close, window_high, window_low)
-        if signal is None:
-            continue
+    # Local aliases: the loop body resolves these with LOAD_FAST instead of
+    # two dict lookups through the settings module per use.
+    lookback = LOOKBACK_BARS
+    min_rr   = MIN_RISK_REWARD
+    risk_pct = ACCOUNT_RISK_PER_TRADE
 
-        # Risk / reward check
-        risk   = abs(signal["entry"] - signal["stop"])
-        reward = abs(signal["target"] - signal["entry"])
-        if risk <= 0 or (reward / risk) < MIN_RISK_REWARD:
-            continue
+    i = lookback
+    while i < n:
+        # ── Look for new entry ────────────────────────────────────────────
+        # Most bars have no entry; the kernel burns through them in native
+        # code and only returns control here when a trade actually opens.
+        i, side, entry, stop, target, bars_since = _next_entry_nb(
+            closes, highs, lows, sh_all, sl_all, i,
+            lookback, SWING_LOOKBACK, RETRACEMENT_TOLERANCE, min_rr,
+        )
+        if i < 0:
+            break
+        entry  = float(entry)
+        stop   = float(stop)
+        target = float(target)
+        risk   = entry - stop if side > 0 else stop - entry
+        reward = target - entry if side > 0 else entry - target
 
         # Position sizing
-        dollar_risk   = balance * ACCOUNT_RISK_PER_TRADE
+        dollar_risk   = balance * risk_pct
         qty           = max(1, int(dollar_risk / risk))
-        trade_value   = qty * signal["entry"]
+        trade_value   = qty * entry
         if trade_value > balance * 0.95:
-            qty = max(1, int(balance * 0.95 / signal["entry"]))
+            qty = max(1, int(balance * 0.95 / entry))
 
-        balance -= qty * signal["entry"]
+        balance -= qty * entry
 
         open_trade = BacktestTrade(
             symbol=symbol,
-            side=signal["side"],
-            entry_date=bar_date,
+            side="BUY" if side > 0 else "SELL",
+            entry_date=bar_dates[i],
             exit_date="",
-            entry_price=round(signal["entry"], 2),
-            exit_price=round(signal["stop"] if True else signal["target"], 2),
+            entry_price=round(entry, 2),
+            exit_price=round(stop, 2),
             qty=qty,
             pnl=0.0,
             pnl_pct=0.0,
             exit_reason="STOP-LOSS",
-            confidence=signal["confidence"],
+            confidence=_confidence(reward / risk, bars_since),
             rr_ratio=round(reward / risk, 2),
+            tp=round(target, 2),
+        )
+        sl = open_trade.exit_price
+        tp = open_trade.tp
+
+        # ── Find the exit bar in one vectorized pass ──────────────────────
+        # Instead of stepping bar-by-bar, scan all remaining bars at once
+        # for the first touch of either exit level. Branch on the kernel's
+        # int side code — no string compare in the scan.
+        if side > 0:
+            hit = (lows[i + 1:] <= sl) | (highs[i + 1:] >= tp)
+        else:
+            hit = (highs[i + 1:] >= sl) | (lows[i + 1:] <= tp)
+
+        if not hit.any():
+            break  # trade stays open to the end of the data
+
+        j = i + 1 + int(np.argmax(hit))
+        # Stop has priority when both levels trade inside the same bar
+        # (conservative: assume the adverse move happened first).
+        stop_hit = float(lows[j]) <= sl if side > 0 else float(highs[j]) >= sl
+        balance = _close_trade(
+            open_trade, sl if stop_hit else tp,
+            "STOP-LOSS" if stop_hit else "TAKE-PROFIT",
+            bar_dates[j], result, balance,
         )
-        # Set proper exit targets
-        open_trade.exit_price  = round(signal["stop"], 2)
-        open_trade.exit_reason = "STOP-LOSS"
-        # We'll check both SL and TP each bar — encode TP separately
-        open_trade._tp = round(signal["target"], 2)  # type: ignore[attr-defined]
+        open_trade = None
+
+        i = j + 1  # resume the entry scan after the exit bar
 
     # Close any still-open trade at end of data
     if open_trade:
-        last_close = float(closes[-1])
-        pnl = (last_close - open_trade.entry_price) * open_trade.qty
-        if open_trade.side == "SELL":
-            pnl = (open_trade.entry_price - last_close) * open_trade.qty
-        open_trade.pnl       = round(pnl, 2)
-        open_trade.pnl_pct   = round(pnl / (open_trade.entry_price * open_trade.qty) * 100, 2)
-        open_trade.exit_date  = str(df.index[-1])[:19]
-        open_trade.exit_price = round(last_close, 2)
-        open_trade.exit_reason = "END-OF-DATA"
-        result.trades.append(open_trade)
+        balance = _close_trade(
+            open_trade, float(closes[-1]), "END-OF-DATA",
+            bar_dates[-1], result, balance,
+        )
 
     return result
 
 
-def _detect_long(closes, highs, lows):
-    n = len(closes)
-    sh = _swing_points(highs, SWING_LOOKBACK, is_high=True)
-    if len(sh) < 2: return None
-    slope, intercept = _fit_line(sh[-3:], highs[sh[-3:]])
-    if slope is None or slope >= 0: return None
+def _close_trade(
+    trade: BacktestTrade,
+    fill: float,
+    reason: str,
+    bar_date: str,
+    result: BacktestResult,
+    balance: float,
+) -> float:
+    """Book an exit fill on `trade` and return the updated balance.
+
+    One code path for both sides and all exit reasons — the sign
+    multiplier replaces the four near-identical branches the exit
+    block used to carry.
+    """
+    sgn = 1.0 if trade.side == "BUY" else -1.0
+    pnl = sgn * (fill - trade.entry_price) * trade.qty
+    trade.pnl         = round(pnl, 2)
+    trade.pnl_pct     = round(pnl / (trade.entry_price * trade.qty) * 100, 2)
+    trade.exit_date   = bar_date
+    trade.exit_price  = round(fill, 2)
+    trade.exit_reason = reason
+    result.trades.append(trade)
+    return balance + fill * trade.qty + pnl
+
+
+@njit(cache=True)
+def _detect_long_nb(closes, highs, lows, swings, tolerance):
+    """Long detector compiled to native code — sentinel tuple instead of
+    dict/None so the whole call tree stays in nopython mode.
+
+    `swings` holds the window-relative indices of the last ≤3 confirmed
+    swing highs, precomputed once per symbol by the caller.
+    """
+    no_signal = (False, 0.0, 0.0, 0.0, 0)
+    n = closes.shape[0]
+    m = swings.shape[0]
+    if m < 2:
+        return no_signal
+    x = np.empty(m, np.float64)
+    y = np.empty(m, np.float64)
+    for i in range(m):
+        x[i] = swings[i]
+        y[i] = highs[swings[i]]
+    slope, intercept, ok = _fit_line_nb(x, y)
+    if not ok or slope >= 0.0:
+        return no_signal
+    # tl_curr for bar n-back is tl_prev of the previous iteration, so each
+    # step costs one FMA instead of two; tl_now is the first tl_curr.
+    tl_now  = slope * (n - 1) + intercept
+    tl_curr = tl_now
     for back in range(1, min(9, n)):
-        tl_prev = slope * (n-1-back) + intercept
-        tl_curr = slope * (n-back)   + intercept
-        if closes[n-1-back] < tl_prev and closes[n-back] >= tl_curr:
+        tl_prev = slope * (n - 1 - back) + intercept
+        if closes[n - 1 - back] < tl_prev and closes[n - back] >= tl_curr:
             bars_since = back - 1
-            tl_now      = slope * (n-1) + intercept
-            bk_high     = float(highs[n-back:].max())
-            retest_low  = float(lows[n-back:].min())
-            if retest_low > tl_now * (1 + RETRACEMENT_TOLERANCE): return None
-            if closes[-1] < tl_now * (1 - RETRACEMENT_TOLERANCE): return None
-            entry  = float(closes[-1])
+            bk_high    = highs[n - back:].max()
+            retest_low = lows[n - back:].min()
+            if retest_low > tl_now * (1.0 + tolerance):
+                return no_signal
+            if closes[n - 1] < tl_now * (1.0 - tolerance):
+                return no_signal
+            entry  = closes[n - 1]
             stop   = round(retest_low * 0.998, 2)
             target = round(bk_high, 2)
             risk   = entry - stop
             reward = target - entry
-            if risk <= 0 or reward <= 0: return None
-            return {"side":"BUY","entry":entry,"stop":stop,"target":target,
-                    "confidence":_confidence(reward/risk, bars_since)}
-    return None
-
-
-def _detect_short(closes, highs, lows):
-    n = len(closes)
-    sl = _swing_points(lows, SWING_LOOKBACK, is_high=False)
-    if len(sl) < 2: return None
-    slope, intercept = _fit_line(sl[-3:], lows[sl[-3:]])
-    if slope is None or slope <= 0: return None
+            if risk <= 0.0 or reward <= 0.0:
+                return no_signal
+            return True, entry, stop, target, bars_since
+        tl_curr = tl_prev
+    return no_signal
+
+
+@njit(cache=True)
+def _detect_short_nb(closes, highs, lows, swings, tolerance):
+    """Short detector — exact mirror of _detect_long_nb."""
+    no_signal = (False, 0.0, 0.0, 0.0, 0)
+    n = closes.shape[0]
+    m = swings.shape[0]
+    if m < 2:
+        return no_signal
+    x = np.empty(m, np.float64)
+    y = np.empty(m, np.float64)
+    for i in range(m):
+        x[i] = swings[i]
+        y[i] = lows[swings[i]]
+    slope, intercept, ok = _fit_line_nb(x, y)
+    if not ok or slope <= 0.0:
+        return no_signal
+    tl_now  = slope * (n - 1) + intercept
+    tl_curr = tl_now
     for back in range(1, min(9, n)):
-        tl_prev = slope * (n-1-back) + intercept
-        tl_curr = slope * (n-back)   + intercept
-        if closes[n-1-back] > tl_prev and closes[n-back] <= tl_curr:
-            bars_since = back - 1
-            tl_now     = slope * (n-1) + intercept
-            bk_low     = float(lows[n-back:].min())
-            retest_high = float(highs[n-back:].max())
-            if retest_high < tl_now * (1 - RETRACEMENT_TOLERANCE): return None
-            if closes[-1] > tl_now * (1 + RETRACEMENT_TOLERANCE): return None
-            entry  = float(closes[-1])
+        tl_prev = slope * (n - 1 - back) + intercept
+        if closes[n - 1 - back] > tl_prev and closes[n - back] <= tl_curr:
+            bars_since  = back - 1
+            bk_low      = lows[n - back:].min()
+            retest_high = highs[n - back:].max()
+            if retest_high < tl_now * (1.0 - tolerance):
+                return no_signal
+            if closes[n - 1] > tl_now * (1.0 + tolerance):
+                return no_signal
+            entry  = closes[n - 1]
             stop   = round(retest_high * 1.002, 2)
             target = round(bk_low, 2)
             risk   = stop - entry
             reward = entry - target
-            if risk <= 0 or reward <= 0: return None
-            return {"side":"SELL","entry":entry,"stop":stop,"target":target,
-                    "confidence":_confidence(reward/risk, bars_since)}
-    return None
+            if risk <= 0.0 or reward <= 0.0:
+                return no_signal
+            return True, entry, stop, target, bars_since
+        tl_curr = tl_prev
+    return no_signal
+
+
+@njit(cache=True)
+def _detect_signal_nb(closes, highs, lows, swings_h, swings_l, tolerance):
+    """Single fused pass: try the long setup, fall back to the short one.
+
+    Returns (side_code, entry, stop, target, bars_since) with side_code
+    +1 long / -1 short / 0 none. The short fit only runs when the long
+    scan found nothing, so at most one extra regression per bar.
+    """
+    found, entry, stop, target, bars_since = _detect_long_nb(
+        closes, highs, lows, swings_h, tolerance
+    )
+    if found:
+        return 1, entry, stop, target, bars_since
+    found, entry, stop, target, bars_since = _detect_short_nb(
+        closes, highs, lows, swings_l, tolerance
+    )
+    if found:
+        return -1, entry, stop, target, bars_since
+    return 0, 0.0, 0.0, 0.0, 0
+
+
+@njit(cache=True)
+def _next_entry_nb(
+    closes, highs, lows, sh_all, sl_all, start, lookback, swing_lb, tolerance, min_rr
+):
+    """Scan forward from `start` until a bar produces a qualifying entry.
+
+    The per-bar work — swing selection, both detector passes, the R:R
+    gate — all happens in native code, so the Python replay loop only
+    wakes up once per trade instead of once per bar. Returns
+    (bar, side, entry, stop, target, bars_since); bar == -1 when the
+    remaining data holds no entry. `start` must be >= lookback.
+    """
+    n = closes.shape[0]
+    for i in range(start, n):
+        ws = i - lookback
+
+        lo = np.searchsorted(sh_all, ws + swing_lb)
+        hi = np.searchsorted(sh_all, i - swing_lb)
+        a = lo if lo > hi - 3 else hi - 3
+        swings_h = sh_all[a:hi] - ws
+
+        lo = np.searchsorted(sl_all, ws + swing_lb)
+        hi = np.searchsorted(sl_all, i - swing_lb)
+        a = lo if lo > hi - 3 else hi - 3
+        swings_l = sl_all[a:hi] - ws
+
+        side, entry, stop, target, bars_since = _detect_signal_nb(
+            closes[ws:i], highs[ws:i], lows[ws:i], swings_h, swings_l, tolerance
+        )
+        if side == 0:
+            continue
+        risk   = entry - stop if side > 0 else stop - entry
+        reward = target - entry if side > 0 else entry - target
+        if risk <= 0.0 or reward / risk < min_rr:
+            continue
+        return i, side, entry, stop, target, bars_since
+    return -1, 0, 0.0, 0.0, 0.0, 0
+
+
+def _detect_signal(closes, highs, lows, swings_h, swings_l):
+    """Dict/None wrapper around the fused kernel for the replay loop."""
+    side, entry, stop, target, bars_since = _detect_signal_nb(
+        closes, highs, lows, swings_h, swings_l, RETRACEMENT_TOLERANCE
+    )
+    if side == 0:
+        return None
+    entry = float(entry)
+    stop = float(stop)
+    target = float(target)
+    if side > 0:
+        rr = (target - entry) / (entry - stop)
+        return {"side": "BUY", "entry": entry, "stop": stop, "target": target,
+                "confidence": _confidence(rr, bars_since)}
+    rr = (entry - target) / (stop - entry)
+    return {"side": "SELL", "entry": entry, "stop": stop, "target": target,
+            "confidence": _confidence(rr, bars_since)}
+
+
+def _detect_long(closes, highs, lows, swings=None):
+    if swings is None:
+        swings = _recent_swings(_swing_idx(highs, SWING_LOOKBACK, True), 0, len(closes))
+    found, entry, stop, target, bars_since = _detect_long_nb(
+        closes, highs, lows, swings, RETRACEMENT_TOLERANCE
+    )
+    if not found:
+        return None
+    entry = float(entry)
+    return {"side": "BUY", "entry": entry, "stop": float(stop), "target": float(target),
+            "confidence": _confidence((target - entry) / (entry - stop), bars_since)}
+
+
+def _detect_short(closes, highs, lows, swings=None):
+    if swings is None:
+        swings = _recent_swings(_swing_idx(lows, SWING_LOOKBACK, False), 0, len(closes))
+    found, entry, stop, target, bars_since = _detect_short_nb(
+        closes, highs, lows, swings, RETRACEMENT_TOLERANCE
+    )
+    if not found:
+        return None
+    entry = float(entry)
+    return {"side": "SELL", "entry": entry, "stop": float(stop), "target": float(target),
+            "confidence": _confidence((entry - target) / (stop - entry), bars_since)}
+
+
+def _recent_swings(all_swings: np.ndarray, win_start: int, win_end: int) -> np.ndarray:
+    """Last ≤3 swing indices confirmed inside [win_start, win_end), rebased
+    to window-relative positions.
+
+    A swing at bar g needs its ±SWING_LOOKBACK neighbours, so only swings in
+    [win_start + SWING_LOOKBACK, win_end - SWING_LOOKBACK) are visible to a
+    detector that sees exactly that window — same set the per-window scan
+    produced, found here with two binary searches instead of a rescan.
+    """
+    lo = np.searchsorted(all_swings, win_start + SWING_LOOKBACK)
+    hi = np.searchsorted(all_swings, win_end - SWING_LOOKBACK)
+    return all_swings[max(lo, hi - 3):hi] - win_start
 
 
 # ── Report ────────────────────────────────────────────────────────────────────
 
 def print_report(results: List[BacktestResult], days: int):
-    all_trades = [t for r in results for t in r.trades]
-    total_pnl  = sum(t.pnl for t in all_trades)
-    wins       = [t for t in all_trades if t.pnl > 0]
-    losses     = [t for t in all_trades if t.pnl <= 0]
-    win_rate   = len(wins) / len(all_trades) * 100 if all_trades else 0
+    # One float64 array + boolean masks instead of three Python list scans.
+    pnl      = np.array([t.pnl for r in results for t in r.trades], dtype=np.float64)
+    wins     = pnl[pnl > 0]
+    losses   = pnl[pnl <= 0]
+    win_rate = wins.size / pnl.size * 100 if pnl.size else 0
 
     print("\n" + "═"*60)
     print(f"  BACKTEST RESULTS — last {days} days")
     print("═"*60)
     print(f"  Symbols tested : {', '.join(r.symbol for r in results)}")
-    print(f"  Total trades   : {len(all_trades)}")
-    print(f"  Win rate       : {win_rate:.1f}%  ({len(wins)}W / {len(losses)}L)")
-    print(f"  Total P&L      : ${total_pnl:+,.2f}")
-    print(f"  Avg win        : ${sum(t.pnl for t in wins)/len(wins):+.2f}" if wins else "  Avg win        : n/a")
-    print(f"  Avg loss       : ${sum(t.pnl for t in losses)/len(losses):+.2f}" if losses else "  Avg loss       : n/a")
+    print(f"  Total trades   : {pnl.size}")
+    print(f"  Win rate       : {win_rate:.1f}%  ({wins.size}W / {losses.size}L)")
+    print(f"  Total P&L      : ${pnl.sum():+,.2f}")
+    print(f"  Avg win        : ${wins.mean():+.2f}" if wins.size else "  Avg win        : n/a")
+    print(f"  Avg loss       : ${losses.mean():+.2f}" if losses.size else "  Avg loss       : n/a")
 
     print("\n  Per-symbol breakdown:")
     print(f"  {'Symbol':<8} {'Trades':>7} {'Win%':>7} {'P&L':>10} {'Prof.Factor':>13}")
@@ -330,52 +611,96 @@ def print_report(results: List[BacktestResult], days: int):
     print("═"*60 + "\n")
 
 
+def save_pickle(results: List[BacktestResult]) -> str:
+    """Persist the full results (protocol 5) for fast programmatic reloads.
+
+    Pickle skips the per-field quoting/escaping CSV pays, so large
+    multi-symbol sweeps serialize in one cheap pass; the CSV below stays
+    the interchange format the dashboard reads.
+    """
+    os.makedirs(TRADES_DIR, exist_ok=True)
+    path = os.path.join(TRADES_DIR, f"backtest_results_{datetime.now().strftime('%Y-%m-%d')}.pkl")
+    with open(path, "wb") as fh:
+        pickle.dump(results, fh, protocol=5)
+    return path
+
+
+def _csv_rows(results: List[BacktestResult]):
+    for r in results:
+        for t in r.trades:
+            yield (t.symbol, t.side, t.entry_date, t.exit_date,
+                   t.entry_price, t.exit_price, t.qty, t.pnl, t.pnl_pct,
+                   t.exit_reason, t.confidence, t.rr_ratio)
+
+
 def save_csv(results: List[BacktestResult]):
     os.makedirs(TRADES_DIR, exist_ok=True)
     path = os.path.join(TRADES_DIR, f"backtest_results_{datetime.now().strftime('%Y-%m-%d')}.csv")
     headers = ["symbol","side","entry_date","exit_date","entry_price",
                "exit_price","qty","pnl","pnl_pct","exit_reason","confidence","rr_ratio"]
-    with open(path, "w", newline="") as fh:
+    # writerows + a 1 MiB buffer: one Python→C transition for the whole
+    # report and a handful of write syscalls instead of one per trade.
+    with open(path, "w", newline="", buffering=1 << 20) as fh:
         w = csv.writer(fh)
         w.writerow(headers)
-        for r in results:
-            for t in r.trades:
-                w.writerow([t.symbol, t.side, t.entry_date, t.exit_date,
-                            t.entry_price, t.exit_price, t.qty, t.pnl, t.pnl_pct,
-                            t.exit_reason, t.confidence, t.rr_ratio])
+        w.writerows(_csv_rows(results))
     print(f"  Results saved to: {path}\n")
     return path
 
 
 # ── Entry point ───────────────────────────────────────────────────────────────
 
-def main():
-    parser = argparse.ArgumentParser(description="Backtest the trendline strategy")
-    parser.add_argument("--days",   type=int, default=90,    help="Lookback days (default 90)")
-    parser.add_argument("--symbol", type=str, default=None,  help="Single symbol (default: all)")
-    args = parser.parse_args()
+def _run_one(symbol: str, df: Optional[pd.DataFrame]) -> Optional[BacktestResult]:
+    """Simulate one already-fetched symbol (top-level so it pickles for the pool)."""
+    if df is None or len(df) < LOOKBACK_BARS + 10:
+        logger.warning(f"{symbol}: not enough data, skipping")
+        return None
+    logger.info(f"{symbol}: {len(df)} bars loaded — running strategy...")
+    res = simulate_symbol(symbol, df, STARTING_BALANCE)
+    logger.info(f"{symbol}: {res.total_trades} trades found")
+    return res
 
-    symbols = [args.symbol.upper()] if args.symbol else SYMBOLS
-    print(f"\n  Running backtest: {args.days} days | {', '.join(symbols)}")
+
+def run(days: int, symbol: Optional[str] = None,
+        use_cache: bool = True, write_csv: bool = True):
+    """Fetch, simulate, and save one backtest — callable without the CLI."""
+    symbols = [symbol.upper()] if symbol else SYMBOLS
+    print(f"\n  Running backtest: {days} days | {', '.join(symbols)}")
     print("  Downloading data...\n")
 
-    results = []
-    for sym in symbols:
-        df = fetch_history(sym, args.days)
-        if df is None or len(df) < LOOKBACK_BARS + 10:
-            logger.warning(f"{sym}: not enough data, skipping")
-            continue
-        logger.info(f"{sym}: {len(df)} bars loaded — running strategy...")
-        res = simulate_symbol(sym, df, STARTING_BALANCE)
-        results.append(res)
-        logger.info(f"{sym}: {res.total_trades} trades found")
+    history = fetch_history_many(symbols, days, use_cache=use_cache)
+
+    # Per-symbol simulations share no mutable state, so fan out across
+    # processes — the hot loop is Python bytecode under the GIL, so threads
+    # would serialize. Wall-time drops from the sum to the max over symbols.
+    by_sym = {}
+    with ProcessPoolExecutor(max_workers=min(len(symbols), os.cpu_count() or 1)) as ex:
+        futures = {ex.submit(_run_one, sym, history.get(sym)): sym for sym in symbols}
+        for fut in as_completed(futures):
+            res = fut.result()
+            if res is not None:
+                by_sym[futures[fut]] = res
+    results = [by_sym[s] for s in symbols if s in by_sym]
 
     if not results:
         print("  No results — try reducing --days or check your symbols.")
         return
 
-    print_report(results, args.days)
-    save_csv(results)
+    print_report(results, days)
+    save_pickle(results)
+    if write_csv:
+        save_csv(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the trendline strategy")
+    parser.add_argument("--days",   type=int, default=90,    help="Lookback days (default 90)")
+    parser.add_argument("--symbol", type=str, default=None,  help="Single symbol (default: all)")
+    parser.add_argument("--no-cache", action="store_true",   help="Skip the on-disk bar cache")
+    parser.add_argument("--no-csv",   action="store_true",   help="Skip the CSV export (pickle only)")
+    args = parser.parse_args()
+    run(args.days, symbol=args.symbol,
+        use_cache=not args.no_cache, write_csv=not args.no_csv)
 
 
 if __name__ == "__main__":
@@ -22,6 +22,7 @@ STARTING_BALANCE: float = float(os.getenv("STARTING_BALANCE", "50000.0"))
 
 # ── Risk management ───────────────────────────────────────────────────────────
 DOLLAR_RISK_PER_TRADE: float = float(os.getenv("DOLLAR_RISK_PER_TRADE", "270.0"))   # Fixed $ risk
+ACCOUNT_RISK_PER_TRADE: float = float(os.getenv("ACCOUNT_RISK_PER_TRADE", "0.01"))   # % of equity (backtest)
 MAX_DAILY_LOSS_PCT: float = float(os.getenv("MAX_DAILY_LOSS_PCT", "0.03"))           # 3% daily stop
 MAX_OPEN_TRADES: int = int(os.getenv("MAX_OPEN_TRADES", "3"))
 MIN_RISK_REWARD: float = float(os.getenv("MIN_RISK_REWARD", "1.5"))
@@ -3,7 +3,7 @@
 Live Trading Dashboard
 ======================
 Run this in a second terminal window while main.py is running.
-Refreshes every 5 seconds and shows:
+Redraws when the trade/log files change (30-second heartbeat) and shows:
   - Account summary (balance, daily P&L, open positions)
   - Open positions table
   - Recent trades table
@@ -13,10 +13,11 @@ Usage:
     venv\Scripts\activate
     python dashboard.py
 """
-import csv
 import os
+import re
+import threading
 import time
-from datetime import datetime
+from datetime import datetime, time as dtime
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
@@ -29,10 +30,22 @@ from rich.table import Table
 from rich.text import Text
 from rich import box
 
+from utils.csv_cache import column_sum, read_csv_rows
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:          # watchdog not installed — fall back to polling
+    FileSystemEventHandler = object
+    Observer = None
+
 _NY = ZoneInfo("America/New_York")
+_MARKET_OPEN  = dtime(9, 30)
+_MARKET_CLOSE = dtime(16, 0)
 TRADES_DIR = "trades"
 LOG_DIR    = "logs"
-REFRESH_SECONDS = 5
+REFRESH_SECONDS   = 5        # polling fallback when watchdog is unavailable
+HEARTBEAT_SECONDS = 30       # clock/heartbeat redraw between file events
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
@@ -41,24 +54,33 @@ def today() -> str:
     return datetime.now().strftime("%Y-%m-%d")
 
 
-def read_csv(path: str) -> list[dict]:
-    if not os.path.exists(path):
-        return []
-    try:
-        with open(path, newline="") as fh:
-            return list(csv.DictReader(fh))
-    except Exception:
-        return []
+def read_csv(path: str) -> list[tuple]:
+    # Incremental: only the rows appended since the last refresh get parsed.
+    # Rows are namedtuples — columns read as attributes (row.symbol).
+    return read_csv_rows(path)
 
 
 def tail_log(n: int = 12) -> list[str]:
     path = os.path.join(LOG_DIR, f"trading_{today()}.log")
-    if not os.path.exists(path):
+    try:
+        size = os.path.getsize(path)   # one stat: existence check included
+    except OSError:
         return ["No log file yet — start main.py first."]
     try:
-        with open(path) as fh:
-            lines = fh.readlines()
-        return [l.rstrip() for l in lines[-n:]]
+        # Read a window from the end of the file instead of the whole log;
+        # the window doubles until it contains n lines (or the full file).
+        window = 8192
+        with open(path, "rb") as fh:
+            while True:
+                fh.seek(max(0, size - window))
+                chunk = fh.read()
+                lines = chunk.splitlines()
+                if window >= size or len(lines) > n:
+                    break
+                window *= 2
+        if window < size:
+            lines = lines[1:]  # first line may be a partial — drop it
+        return [l.decode(errors="replace").rstrip() for l in lines[-n:]]
     except Exception:
         return []
 
@@ -73,10 +95,7 @@ def pnl_color(val: float) -> str:
 
 def build_header() -> Panel:
     now  = datetime.now(_NY)
-    wd   = now.weekday()
-    open_time  = now.replace(hour=9,  minute=30, second=0, microsecond=0)
-    close_time = now.replace(hour=16, minute=0,  second=0, microsecond=0)
-    is_open = (wd < 5) and (open_time <= now <= close_time)
+    is_open = now.weekday() < 5 and _MARKET_OPEN <= now.time() <= _MARKET_CLOSE
     status  = "[bold green]MARKET OPEN[/]" if is_open else "[bold red]MARKET CLOSED[/]"
     time_str = now.strftime("%I:%M:%S %p ET  —  %A %b %d, %Y")
     return Panel(
@@ -86,27 +105,10 @@ def build_header() -> Panel:
     )
 
 
-def build_account(trades: list[dict], exits: list[dict]) -> Panel:
-    # Starting balance from .env (default 10000)
-    try:
-        from config.settings import STARTING_BALANCE
-        starting = STARTING_BALANCE
-    except Exception:
-        starting = 10_000.0
-
-    # Calculate realised P&L from exits
-    realised = sum(float(r.get("pnl", 0)) for r in exits)
-
-    # Open positions = entries without a matching exit
-    exited_ids = {r.get("order_id") for r in exits}
-    open_trades = [t for t in trades if t.get("order_id") not in exited_ids
-                   and t.get("status", "").startswith("FILLED")]
-
+def build_account(starting: float, realised: float,
+                  open_trades: list[tuple], exits_len: int) -> Panel:
     # Approximate current balance
-    spent_open = sum(
-        float(t.get("entry_price", 0)) * int(t.get("qty", 0))
-        for t in open_trades
-    )
+    spent_open = sum(t.entry_price * t.qty for t in open_trades)
     cash = starting + realised - spent_open
 
     grid = Table.grid(padding=(0, 2))
@@ -117,17 +119,13 @@ def build_account(trades: list[dict], exits: list[dict]) -> Panel:
                  Text(f"${realised:>+12,.2f}", style=pnl_color(realised)))
     grid.add_row("Est. cash balance", f"${cash:>12,.2f}")
     grid.add_row("Open positions",   f"{len(open_trades):>12}")
-    grid.add_row("Closed trades",    f"{len(exits):>12}")
+    grid.add_row("Closed trades",    f"{exits_len:>12}")
 
     return Panel(grid, title="[bold]Account Summary[/]", box=box.ROUNDED,
                  border_style="cyan")
 
 
-def build_open_positions(trades: list[dict], exits: list[dict]) -> Panel:
-    exited_ids = {r.get("order_id") for r in exits}
-    open_trades = [t for t in trades if t.get("order_id") not in exited_ids
-                   and t.get("status", "").startswith("FILLED")]
-
+def build_open_positions(open_trades: list[tuple]) -> Panel:
     tbl = Table(box=box.SIMPLE_HEAD, show_edge=False,
                 header_style="bold magenta")
     tbl.add_column("Symbol",  style="bold white", width=8)
@@ -143,23 +141,23 @@ def build_open_positions(trades: list[dict], exits: list[dict]) -> Panel:
         tbl.add_row("[dim]No open positions[/]", "", "", "", "", "", "", "")
     else:
         for t in open_trades:
-            side_color = "green" if t.get("side") == "BUY" else "red"
+            side_color = "green" if t.side == "BUY" else "red"
             tbl.add_row(
-                t.get("symbol", ""),
-                f"[{side_color}]{t.get('side','')}[/]",
-                t.get("qty", ""),
-                f"${float(t.get('entry_price',0)):.2f}",
-                f"${float(t.get('stop_loss',0)):.2f}",
-                f"${float(t.get('take_profit',0)):.2f}",
-                f"${float(t.get('dollar_risk',0)):.2f}",
-                t.get("timestamp", "")[:19],
+                t.symbol,
+                f"[{side_color}]{t.side}[/]",
+                str(t.qty),
+                f"${t.entry_price:.2f}",
+                f"${t.stop_loss:.2f}",
+                f"${t.take_profit:.2f}",
+                f"${t.dollar_risk:.2f}",
+                t.timestamp[:19],
             )
 
     return Panel(tbl, title=f"[bold]Open Positions ({len(open_trades)})[/]",
                  box=box.ROUNDED, border_style="green")
 
 
-def build_recent_exits(exits: list[dict]) -> Panel:
+def build_recent_exits(recent_exits: list[tuple]) -> Panel:
     tbl = Table(box=box.SIMPLE_HEAD, show_edge=False,
                 header_style="bold magenta")
     tbl.add_column("Symbol",  style="bold white", width=8)
@@ -171,60 +169,140 @@ def build_recent_exits(exits: list[dict]) -> Panel:
     tbl.add_column("Reason",  width=12)
     tbl.add_column("Time",    width=20)
 
-    recent = list(reversed(exits[-10:]))
+    recent = list(reversed(recent_exits))
 
     if not recent:
         tbl.add_row("[dim]No closed trades yet[/]", "", "", "", "", "", "", "")
     else:
         for r in recent:
-            pnl = float(r.get("pnl", 0))
-            side_color = "green" if r.get("side") == "BUY" else "red"
-            reason = r.get("exit_reason", "")
+            pnl = r.pnl
+            side_color = "green" if r.side == "BUY" else "red"
+            reason = r.exit_reason
             reason_color = "green" if reason == "TAKE-PROFIT" else "red"
             tbl.add_row(
-                r.get("symbol", ""),
-                f"[{side_color}]{r.get('side','')}[/]",
-                r.get("qty", ""),
-                f"${float(r.get('entry_price',0)):.2f}",
-                f"${float(r.get('exit_price',0)):.2f}",
+                r.symbol,
+                f"[{side_color}]{r.side}[/]",
+                str(r.qty),
+                f"${r.entry_price:.2f}",
+                f"${r.exit_price:.2f}",
                 Text(f"${pnl:+.2f}", style=pnl_color(pnl)),
                 f"[{reason_color}]{reason}[/]",
-                r.get("timestamp", "")[:19],
+                r.timestamp[:19],
             )
 
     return Panel(tbl, title="[bold]Recent Closed Trades[/]",
                  box=box.ROUNDED, border_style="yellow")
 
 
+# One compiled scan per log line instead of five chained substring checks;
+# the leftmost tag in the line picks the style (log lines carry one tag).
+_LOG_TAG_RE = re.compile(r"ERROR|FILLED|CLOSED|APPROVED|REJECTED")
+_LOG_STYLE = {
+    "ERROR":    "red",
+    "FILLED":   "bold green",
+    "CLOSED":   "bold yellow",
+    "APPROVED": "cyan",
+    "REJECTED": "dim red",
+}
+
+
 def build_log() -> Panel:
     lines = tail_log(12)
     colored = []
     for line in lines:
-        if "ERROR"    in line: colored.append(f"[red]{line}[/]")
-        elif "FILLED" in line: colored.append(f"[bold green]{line}[/]")
-        elif "CLOSED" in line: colored.append(f"[bold yellow]{line}[/]")
-        elif "APPROVED" in line: colored.append(f"[cyan]{line}[/]")
-        elif "REJECTED" in line: colored.append(f"[dim red]{line}[/]")
-        else:                   colored.append(f"[dim]{line}[/]")
+        m = _LOG_TAG_RE.search(line)
+        style = _LOG_STYLE[m.group(0)] if m else "dim"
+        colored.append(f"[{style}]{line}[/]")
     return Panel("\n".join(colored), title="[bold]Live Log[/]",
                  box=box.ROUNDED, border_style="dim white")
 
 
 # ── Main render loop ──────────────────────────────────────────────────────────
 
+# section name → (source key, rendered Panel). Data panels are rebuilt only
+# when the files behind them change; the header clock rebuilds every tick.
+_PANEL_CACHE: dict[str, tuple] = {}
+
+
+def _memo_panel(name: str, key, build) -> Panel:
+    cached = _PANEL_CACHE.get(name)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    panel = build()
+    _PANEL_CACHE[name] = (key, panel)
+    return panel
+
+
+def _stat_key(path: str):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+class _RedrawHandler(FileSystemEventHandler):
+    """Sets an event whenever anything under trades/ or logs/ changes."""
+
+    def __init__(self, changed: threading.Event):
+        self._changed = changed
+
+    def on_any_event(self, event):
+        self._changed.set()
+
+
+def _start_watcher(changed: threading.Event):
+    """Watch trades/ and logs/; returns the observer, or None if unavailable."""
+    if Observer is None:
+        return None
+    observer = Observer()
+    handler = _RedrawHandler(changed)
+    for d in (TRADES_DIR, LOG_DIR):
+        os.makedirs(d, exist_ok=True)
+        observer.schedule(handler, d)
+    observer.daemon = True
+    observer.start()
+    return observer
+
+
+
 def build_screen() -> Layout:
     trades_path = os.path.join(TRADES_DIR, f"trades_{today()}.csv")
     exits_path  = os.path.join(TRADES_DIR, f"exits_{today()}.csv")
     trades = read_csv(trades_path)
     exits  = read_csv(exits_path)
 
+    # Starting balance from .env (default 10000)
+    try:
+        from config.settings import STARTING_BALANCE
+        starting = STARTING_BALANCE
+    except Exception:
+        starting = 10_000.0
+
+    # Shared by the account and open-positions panels — computed once
+    # per refresh instead of once per panel.
+    realised = column_sum(exits_path, "pnl")
+    exited_ids = {r.order_id for r in exits}
+    open_trades = [t for t in trades if t.order_id not in exited_ids
+                   and t.status.startswith("FILLED")]
+
+    trade_key = (_stat_key(trades_path), _stat_key(exits_path))
+    log_key = _stat_key(os.path.join(LOG_DIR, f"trading_{today()}.log"))
+
     layout = Layout()
     layout.split_column(
-        Layout(build_header(),                       name="header",   size=4),
-        Layout(build_account(trades, exits),         name="account",  size=9),
-        Layout(build_open_positions(trades, exits),  name="open",     size=10),
-        Layout(build_recent_exits(exits),            name="exits",    size=12),
-        Layout(build_log(),                          name="log",      size=15),
+        Layout(build_header(), name="header", size=4),
+        Layout(_memo_panel("account", trade_key,
+                           lambda: build_account(starting, realised,
+                                                 open_trades, len(exits))),
+               name="account", size=9),
+        Layout(_memo_panel("open", trade_key,
+                           lambda: build_open_positions(open_trades)),
+               name="open", size=10),
+        Layout(_memo_panel("exits", trade_key[1],
+                           lambda: build_recent_exits(exits[-10:])),
+               name="exits", size=12),
+        Layout(_memo_panel("log", log_key, build_log), name="log", size=15),
     )
     return layout
 
@@ -234,18 +312,33 @@ def main():
     console.clear()
     console.print(Panel(
         "[bold cyan]AI Day Trading Dashboard[/]\n"
-        "[dim]Refreshes every 5 seconds. Press Ctrl-C to exit.[/]",
+        "[dim]Redraws on trade/log activity. Press Ctrl-C to exit.[/]",
         box=box.DOUBLE_EDGE
     ))
 
+    # Event-driven redraw: sleep until a trade/log file actually changes
+    # instead of rebuilding the whole layout on a fixed timer. The wait
+    # timeout doubles as a heartbeat so the header clock stays roughly
+    # current on quiet markets.
+    changed = threading.Event()
+    observer = _start_watcher(changed)
+
     with Live(build_screen(), console=console,
               refresh_per_second=1, screen=True) as live:
         try:
             while True:
-                time.sleep(REFRESH_SECONDS)
+                if observer is not None:
+                    changed.wait(timeout=HEARTBEAT_SECONDS)
+                    changed.clear()
+                else:
+                    time.sleep(REFRESH_SECONDS)
                 live.update(build_screen())
         except KeyboardInterrupt:
             pass
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
 
     console.print("\n[dim]Dashboard closed.[/]")
 
@@ -15,7 +15,7 @@ Run:
 Stop cleanly with Ctrl-C.
 """
 import time
-from datetime import datetime
+from datetime import datetime, time as dtime, timedelta
 from zoneinfo import ZoneInfo
 
 from agents.execution_agent import ExecutionAgent
@@ -27,6 +27,8 @@ from utils.logger import setup_logger
 logger = setup_logger("main")
 
 _NY = ZoneInfo("America/New_York")
+_MARKET_OPEN  = dtime(9, 30)
+_MARKET_CLOSE = dtime(16, 0)
 
 
 # ── Market-hours gate ─────────────────────────────────────────────────────────
@@ -34,11 +36,18 @@ _NY = ZoneInfo("America/New_York")
 def _market_is_open() -> bool:
     """Return True during regular US equity market hours (Mon–Fri 09:30–16:00 ET)."""
     now = datetime.now(_NY)
-    if now.weekday() >= 5:                          # Saturday=5, Sunday=6
-        return False
-    market_open  = now.replace(hour=9,  minute=30, second=0, microsecond=0)
-    market_close = now.replace(hour=16, minute=0,  second=0, microsecond=0)
-    return market_open <= now <= market_close
+    # Saturday=5, Sunday=6; comparing time-of-day against the module
+    # constants avoids building two throwaway datetimes per check.
+    return now.weekday() < 5 and _MARKET_OPEN <= now.time() <= _MARKET_CLOSE
+
+
+def _seconds_until_open(now: datetime) -> float:
+    """Seconds from `now` until the next regular session open (Mon–Fri 09:30 ET)."""
+    target = now.replace(hour=_MARKET_OPEN.hour, minute=_MARKET_OPEN.minute,
+                         second=0, microsecond=0)
+    while target <= now or target.weekday() >= 5:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
 
 
 # ── Main loop ─────────────────────────────────────────────────────────────────
@@ -61,8 +70,14 @@ def run() -> None:
         try:
             # ── Market-hours check ─────────────────────────────────────────
             if not _market_is_open():
-                logger.info("Market is closed — sleeping 60s …")
-                time.sleep(60)
+                # Sleep through the whole closed period in one go instead of
+                # waking (and logging) every 60s, capped at an hour so Ctrl-C
+                # and wall-clock changes stay responsive.
+                secs = _seconds_until_open(datetime.now(_NY))
+                logger.info(
+                    f"Market is closed — next open in {secs / 3600:.1f}h, sleeping …"
+                )
+                time.sleep(min(secs, 3600))
                 continue
 
             logger.info(f"{'─' * 54}")
@@ -105,16 +120,14 @@ def run() -> None:
                     f"conf={signal.confidence:.0%}"
                 )
 
-                # Pull live context for the risk agent
-                balance          = execution_agent.get_account_balance()
-                open_trade_count = execution_agent.get_open_trade_count()
-                daily_pnl        = execution_agent.get_daily_pnl()
+                # Pull live context for the risk agent in one batched read
+                account = execution_agent.snapshot()
 
                 approved = risk_agent.evaluate_signal(
                     signal,
-                    account_balance=balance,
-                    open_trade_count=open_trade_count,
-                    daily_pnl=daily_pnl,
+                    account_balance=account.cash,
+                    open_trade_count=account.open_trades,
+                    daily_pnl=account.daily_pnl,
                 )
 
                 if not approved.approved:
@@ -0,0 +1,50 @@
+"""
+Disk cache for downloaded bar history.
+
+Backtest reruns with the same (symbol, days, interval) on the same day
+hit a local parquet file instead of going back to Yahoo — a multi-second
+download becomes a ~10 ms read. The cache key includes today's date, so
+entries expire naturally overnight.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from datetime import date
+from typing import Optional
+
+import pandas as pd
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_CACHE_DIR = os.path.join(".cache", "bars")
+
+
+def _cache_path(symbol: str, days: int, interval: str) -> str:
+    key = hashlib.sha256(
+        f"{symbol}|{days}|{interval}|{date.today().isoformat()}".encode()
+    ).hexdigest()
+    return os.path.join(_CACHE_DIR, f"{key}.parquet")
+
+
+def load_bars(symbol: str, days: int, interval: str) -> Optional[pd.DataFrame]:
+    """Return today's cached bars for (symbol, days, interval), else None."""
+    path = _cache_path(symbol, days, interval)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception as exc:
+        logger.warning(f"bar cache read failed for {symbol}: {exc}")
+        return None
+
+
+def store_bars(symbol: str, days: int, interval: str, df: pd.DataFrame) -> None:
+    """Write bars to the disk cache; failures are logged, never fatal."""
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        df.to_parquet(_cache_path(symbol, days, interval), compression="zstd")
+    except Exception as exc:
+        logger.warning(f"bar cache write failed for {symbol}: {exc}")
@@ -0,0 +1,153 @@
+"""
+Incremental reader for the append-only trade-log CSVs.
+
+The live trades/exits files only ever grow during the day, so a
+dashboard refresh only needs to parse the bytes written since the last
+read: seek to the consumed offset, decode the new tail, and extend the
+cached row list. A file that shrank (rotated or rewritten) is reparsed
+from scratch. Per-refresh cost is O(new rows), not O(file).
+"""
+from __future__ import annotations
+
+import csv
+import io
+import os
+import threading
+from collections import namedtuple
+from typing import Dict, List
+
+# path → {"size": bytes consumed, "row_type": namedtuple class built from the
+#         header, "conv": numeric-column converters, "rows": parsed rows,
+#         "sums": column → (rows counted, running total)}
+_state: Dict[str, dict] = {}
+
+# The web dashboard serves from a threaded WSGI server, so concurrent
+# requests can hit the same file; a per-path lock makes racing readers
+# coalesce on one parse instead of corrupting the shared state.
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(path: str) -> threading.Lock:
+    with _locks_guard:
+        lock = _locks.get(path)
+        if lock is None:
+            lock = _locks[path] = threading.Lock()
+        return lock
+
+# Known numeric columns, coerced once at parse time so the render paths
+# format values directly instead of re-running float() per row per refresh.
+_CONVERTERS = {
+    "qty":          int,
+    "entry_price":  float,
+    "exit_price":   float,
+    "stop_loss":    float,
+    "take_profit":  float,
+    "dollar_risk":  float,
+    "pnl":          float,
+    "confidence":   float,
+    "rr_ratio":     float,
+}
+
+
+def read_csv_rows(path: str, append_only: bool = True) -> List[tuple]:
+    """
+    Return all rows of `path` as namedtuples, parsing only the appended tail.
+
+    A namedtuple per row is leaner than DictReader's dict-per-row (no hash
+    table, fields resolved by index) and Jinja/callers read columns as
+    plain attributes (row.symbol).
+
+    Pass ``append_only=False`` for files that are rewritten in place (the
+    backtest results CSV is overwritten on every same-day rerun): any stat
+    change then reparses from scratch instead of trusting the cached
+    prefix and tail-parsing what may be a completely different file.
+    """
+    with _lock_for(path):
+        return _read_rows_locked(path, append_only)
+
+
+def _read_rows_locked(path: str, append_only: bool) -> List[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        _state.pop(path, None)
+        return []
+
+    state = _state.get(path)
+    if state is not None:
+        if append_only:
+            if st.st_size == state["size"]:
+                return state["rows"]
+            if st.st_size < state["size"]:
+                state = None
+        elif (st.st_mtime_ns, st.st_size) == state["stamp"]:
+            return state["rows"]
+        else:
+            state = None
+    if state is None:
+        state = {"size": 0, "stamp": None, "row_type": None, "conv": (),
+                 "rows": [], "sums": {}}
+        _state[path] = state
+
+    try:
+        with open(path, "rb") as fh:
+            fh.seek(state["size"])
+            chunk = fh.read()
+    except OSError:
+        return state["rows"]
+
+    # Only consume complete lines — a row mid-write stays for next refresh.
+    nl = chunk.rfind(b"\n")
+    if nl < 0:
+        return state["rows"]
+    state["size"] += nl + 1
+    state["stamp"] = (st.st_mtime_ns, st.st_size)
+
+    reader = csv.reader(io.StringIO(chunk[: nl + 1].decode("utf-8", errors="replace")))
+    row_type = state["row_type"]
+    conv = state["conv"]
+    rows = state["rows"]
+    for rec in reader:
+        if row_type is None:
+            fields = [h.strip().replace(" ", "_") for h in rec]
+            row_type = state["row_type"] = namedtuple("Row", fields, rename=True)
+            conv = state["conv"] = tuple(
+                (i, _CONVERTERS[f]) for i, f in enumerate(fields) if f in _CONVERTERS
+            )
+            continue
+        if rec:
+            n = len(row_type._fields)
+            if len(rec) != n:           # ragged row — pad/trim to the header
+                rec = (rec + [""] * n)[:n]
+            for i, to_num in conv:
+                try:
+                    rec[i] = to_num(rec[i])
+                except ValueError:      # malformed cell — leave it as text
+                    pass
+            rows.append(row_type._make(rec))
+    return rows
+
+
+def column_sum(path: str, column: str) -> float:
+    """
+    Running float sum of `column` in `path`.
+
+    Piggybacks on the tail cache: each row's value is converted from
+    text exactly once, when it first appears, and the total is carried
+    forward — a refresh on an unchanged file is a dict lookup.
+    """
+    with _lock_for(path):
+        rows = _read_rows_locked(path, True)
+        state = _state.get(path)
+        if state is None:
+            return 0.0
+        sums = state["sums"]
+        counted, total = sums.get(column, (0, 0.0))
+        for row in rows[counted:]:
+            try:
+                total += float(getattr(row, column, None) or 0.0)
+            except (TypeError, ValueError):
+                pass
+        sums[column] = (len(rows), total)
+        return total
@@ -5,20 +5,94 @@ Fetches 5-minute OHLCV bars for a given symbol.
 """
 from __future__ import annotations
 
-from typing import Optional
+import atexit
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
 
 import pandas as pd
-import yfinance as yf
 
 from config.settings import LOOKBACK_BARS
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# yfinance/requests are imported on first fetch, not at module load — code
+# that imports this module without hitting the network (backtest workers,
+# agent imports) skips their ~300ms import cost.
+_SESSION = None
+
+
+def _session():
+    """Build the shared keep-alive session on first use.
+
+    Connections to Yahoo are pooled instead of re-negotiating TLS per
+    fetch, and transient 429/5xx responses retry with backoff rather
+    than aborting the scan.
+    """
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter, Retry
+
+        _SESSION = requests.Session()
+        _SESSION.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=10,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                ),
+            ),
+        )
+    return _SESSION
+
+# Warm-start store for the in-memory bar cache — a restart resumes with
+# yesterday's bars on disk and only fetches the incremental tail.
+_CACHE_DIR = os.path.join(".cache", "live_bars")
+
 
 class DataFetcher:
     """Fetches 5-minute bars from Yahoo Finance via yfinance."""
 
+    _BAR = pd.Timedelta(minutes=5)
+
+    def __init__(self) -> None:
+        # symbol → last full download; steady-state scans only fetch the
+        # handful of bars that appeared since the previous scan.
+        self._cache: Dict[str, pd.DataFrame] = {}
+        self._load_cache()
+        atexit.register(self.save_cache)
+
+    def _load_cache(self) -> None:
+        """Warm the in-memory cache from .cache/live_bars parquet files."""
+        for p in Path(_CACHE_DIR).glob("*.parquet"):
+            try:
+                self._cache[p.stem] = pd.read_parquet(p)
+            except Exception as exc:
+                logger.warning(f"live bar cache read failed for {p.stem}: {exc}")
+
+    def save_cache(self) -> None:
+        """Persist cached bars to disk; failures are logged, never fatal."""
+        if not self._cache:
+            return
+        try:
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+        except OSError as exc:
+            logger.warning(f"live bar cache dir failed: {exc}")
+            return
+        for sym, df in self._cache.items():
+            try:
+                df.to_parquet(
+                    os.path.join(_CACHE_DIR, f"{sym}.parquet"),
+                    compression="zstd",
+                )
+            except Exception as exc:
+                logger.warning(f"live bar cache write failed for {sym}: {exc}")
+
     def get_bars(self, symbol: str, limit: int = LOOKBACK_BARS) -> Optional[pd.DataFrame]:
         """
         Fetch the most recent `limit` 5-minute bars for `symbol`.
@@ -29,27 +103,110 @@ class DataFetcher:
 
         Note: yfinance provides up to 60 days of 5-minute data.
         """
-        try:
-            ticker = yf.Ticker(symbol)
-            # period="5d" gives enough bars; interval="5m" = 5-minute candles
-            df = ticker.history(period="5d", interval="5m")
+        return self.get_bars_multi([symbol], limit=limit).get(symbol)
 
-            if df is None or df.empty:
-                logger.warning(f"No bar data returned for {symbol}")
-                return None
+    def get_bars_multi(
+        self, symbols: List[str], limit: int = LOOKBACK_BARS
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch the most recent `limit` 5-minute bars for several symbols in
+        one yfinance download (one HTTP round-trip for the whole watchlist).
+
+        Symbols with a recent cached frame only fetch the bars that appeared
+        since the last call and append them; the rest do a full download.
+
+        Returns {symbol: DataFrame}; symbols with no data are omitted.
+        """
+        if not symbols:
+            return {}
+
+        now = pd.Timestamp.now(tz="UTC")
+        warm: List[str] = []
+        cold: List[str] = []
+        for sym in symbols:
+            cached = self._cache.get(sym)
+            try:
+                fresh = (cached is not None and not cached.empty
+                         and now - cached.index[-1] < limit * self._BAR)
+            except TypeError:       # tz-naive index — treat as stale
+                fresh = False
+            (warm if fresh else cold).append(sym)
 
-            # Normalise column names to lowercase
-            df.columns = [c.lower() for c in df.columns]
+        out: Dict[str, pd.DataFrame] = {}
 
-            # Keep standard OHLCV columns only
-            ohlcv = [c for c in ("open", "high", "low", "close", "volume") if c in df.columns]
-            df = df[ohlcv].copy()
+        if warm:
+            start = min(self._cache[s].index[-1] for s in warm) + self._BAR
+            tails = self._download(warm, limit, start=start)
+            for sym in warm:
+                base = self._cache[sym]
+                tail = tails.get(sym)
+                if tail is not None and not tail.empty:
+                    base = pd.concat(
+                        [base, tail[tail.index > base.index[-1]]]
+                    ).tail(limit)
+                    self._cache[sym] = base
+                out[sym] = base.tail(limit)
 
-            df.index.name = "timestamp"
-            df = df.sort_index()
+        if cold:
+            for sym, df in self._download(cold, limit, warn=True).items():
+                self._cache[sym] = df
+                out[sym] = df
 
-            return df.tail(limit)
+        return out
 
+    def _download(
+        self,
+        symbols: List[str],
+        limit: int,
+        start: Optional[pd.Timestamp] = None,
+        warn: bool = False,
+    ) -> Dict[str, pd.DataFrame]:
+        """One batched yf.download; full 5-day window unless `start` is given."""
+        import yfinance as yf   # deferred — only fetch paths pay the import
+
+        window = {"start": start} if start is not None else {"period": "5d"}
+        try:
+            # interval="5m" = 5-minute candles
+            data = yf.download(
+                tickers=" ".join(symbols),
+                interval="5m",
+                group_by="ticker",
+                threads=True,
+                progress=False,
+                session=_session(),
+                **window,
+            )
         except Exception as exc:
-            logger.error(f"DataFetcher.get_bars({symbol}): {exc}")
-            return None
+            logger.error(f"DataFetcher._download({symbols}): {exc}")
+            return {}
+
+        out: Dict[str, pd.DataFrame] = {}
+        for sym in symbols:
+            try:
+                # group_by="ticker" returns (Ticker, Price) columns even for
+                # a single symbol on current yfinance — select by symbol, and
+                # fall back to the squeezed frame older versions produced.
+                try:
+                    df = data[sym]
+                except KeyError:
+                    df = data if len(symbols) == 1 else None
+                if df is not None and not df.empty:
+                    df = self._normalise(df.dropna(how="all"))
+            except Exception:
+                df = None
+            if df is None or df.empty:
+                if warn:
+                    logger.warning(f"No bar data returned for {sym}")
+                continue
+            out[sym] = df.tail(limit)
+        return out
+
+    @staticmethod
+    def _normalise(df: pd.DataFrame) -> pd.DataFrame:
+        """Lowercase column names, keep OHLCV only, sort by timestamp."""
+        df = df.copy()
+        df.columns = [c.lower() for c in df.columns]
+        ohlcv = [c for c in ("open", "high", "low", "close", "volume") if c in df.columns]
+        df = df[ohlcv]
+        df.index.name = "timestamp"
+        return df.sort_index()
@@ -1,40 +1,65 @@
 """
 Centralised logging setup.
 Each module calls setup_logger(__name__) to get its named logger.
+
+Records go through a shared in-process queue: the hot trading loop only
+pays for an enqueue, while a single background QueueListener thread does
+the actual console and file writes.
 """
+import atexit
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
 from config.settings import LOG_DIR
 
+_lock = threading.Lock()
+_queue: "queue.Queue | None" = None
+_listener: "QueueListener | None" = None
+
+
+def _log_queue() -> queue.Queue:
+    """Create the shared queue + listener on first use (one per process)."""
+    global _queue, _listener
+    with _lock:
+        if _queue is None:
+            os.makedirs(LOG_DIR, exist_ok=True)
+
+            fmt = logging.Formatter(
+                "%(asctime)s | %(levelname)-8s | %(name)-28s | %(message)s",
+                datefmt="%Y-%m-%d %H:%M:%S",
+            )
+
+            # Console
+            console = logging.StreamHandler()
+            console.setFormatter(fmt)
+
+            # Daily file
+            today = datetime.now().strftime("%Y-%m-%d")
+            fh = logging.FileHandler(os.path.join(LOG_DIR, f"trading_{today}.log"))
+            fh.setFormatter(fmt)
+
+            _queue = queue.Queue(-1)
+            _listener = QueueListener(_queue, console, fh)
+            _listener.start()
+            atexit.register(_listener.stop)
+    return _queue
+
 
 def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
-    Return a logger that writes to both stdout and a daily rotating log file.
+    Return a logger that writes to both stdout and a daily log file via
+    the background listener thread.
     Safe to call multiple times — handlers are only added once.
     """
-    os.makedirs(LOG_DIR, exist_ok=True)
-
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
     if logger.handlers:
         return logger  # Already configured
 
-    fmt = logging.Formatter(
-        "%(asctime)s | %(levelname)-8s | %(name)-28s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
-    # Console
-    console = logging.StreamHandler()
-    console.setFormatter(fmt)
-    logger.addHandler(console)
-
-    # Daily file
-    today = datetime.now().strftime("%Y-%m-%d")
-    fh = logging.FileHandler(os.path.join(LOG_DIR, f"trading_{today}.log"))
-    fh.setFormatter(fmt)
-    logger.addHandler(fh)
-
+    logger.addHandler(QueueHandler(_log_queue()))
     return logger
@@ -1,68 +1,83 @@
 """
 Web Dashboard — opens in your browser at http://localhost:5001
-Auto-refreshes every 10 seconds. No terminal interaction needed to view.
+Pages update when the trade logs change. No terminal interaction needed to view.
 Pages:
   /            Live trading view (account, open positions, closed trades)
   /calendar    Trade calendar — colour-coded days showing wins/losses
   /backtest    YTD backtest results table + run button
 """
 import calendar
-import csv
-import glob
+import hashlib
 import os
-import subprocess
-import sys
+import time
 import webbrowser
 from collections import defaultdict
-from datetime import datetime, date
-from threading import Timer
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, date, time as dtime
+from threading import Condition, Lock, Timer
 from zoneinfo import ZoneInfo
 
-from flask import Flask, render_template_string, redirect, url_for
+from flask import (Flask, Response, jsonify, redirect, request,
+                   stream_with_context, url_for)
+from flask_compress import Compress
+
+from utils.csv_cache import column_sum, read_csv_rows
+
+# Resolved once — the dashboard should come up even with a broken .env.
+try:
+    from config.settings import STARTING_BALANCE as _STARTING_BALANCE
+except Exception:
+    _STARTING_BALANCE = 10_000.0
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:          # watchdog not installed — clients poll on heartbeat
+    FileSystemEventHandler = object
+    Observer = None
 
 app = Flask(__name__)
+Compress(app)            # gzip HTML/JSON responses (SSE stays uncompressed)
 TRADES_DIR = "trades"
 _NY = ZoneInfo("America/New_York")
+_MARKET_OPEN  = dtime(9, 30)
+_MARKET_CLOSE = dtime(16, 0)
+
+# ── Change notification ───────────────────────────────────────────────────────
+# A generation counter bumped whenever trades/ changes; SSE clients block on
+# the condition instead of the browser blindly reloading every 10 seconds.
+
+_change_cond = Condition()
+_change_gen = 0
+
+
+def _notify_change():
+    global _change_gen
+    with _change_cond:
+        _change_gen += 1
+        _change_cond.notify_all()
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    def on_any_event(self, event):
+        _notify_change()
+
+
+def _start_watcher():
+    if Observer is None:
+        return None
+    os.makedirs(TRADES_DIR, exist_ok=True)
+    observer = Observer()
+    observer.schedule(_ChangeHandler(), TRADES_DIR)
+    observer.daemon = True
+    observer.start()
+    return observer
 
 # ── Shared CSS / nav ──────────────────────────────────────────────────────────
-BASE_STYLE = """
-<style>
-* { box-sizing: border-box; margin: 0; padding: 0; }
-body { font-family: 'Segoe UI', Arial, sans-serif; background: #0d1117; color: #e6edf3; padding: 20px; }
-a { color: #58a6ff; text-decoration: none; }
-a:hover { text-decoration: underline; }
-h1 { font-size: 22px; color: #58a6ff; margin-bottom: 4px; }
-.subtitle { color: #8b949e; font-size: 13px; margin-bottom: 20px; }
-.nav { display: flex; gap: 16px; margin-bottom: 24px; flex-wrap: wrap; }
-.nav a {
-  padding: 6px 18px; border-radius: 6px; border: 1px solid #30363d;
-  font-size: 14px; color: #e6edf3;
-}
-.nav a.active, .nav a:hover { background: #1f6feb; border-color: #1f6feb; color: #fff; text-decoration: none; }
-.cards { display: flex; gap: 14px; margin-bottom: 22px; flex-wrap: wrap; }
-.card { background: #161b22; border: 1px solid #30363d; border-radius: 10px; padding: 14px 22px; min-width: 160px; flex: 1; }
-.card .label { color: #8b949e; font-size: 11px; text-transform: uppercase; letter-spacing: 1px; }
-.card .value { font-size: 26px; font-weight: bold; margin-top: 4px; }
-.green { color: #3fb950; } .red { color: #f85149; } .white { color: #e6edf3; } .blue { color: #58a6ff; }
-.section { background: #161b22; border: 1px solid #30363d; border-radius: 10px; padding: 16px; margin-bottom: 18px; }
-.section h2 { font-size: 13px; color: #8b949e; text-transform: uppercase; letter-spacing: 1px; margin-bottom: 12px; padding-bottom: 8px; border-bottom: 1px solid #30363d; }
-table { width: 100%; border-collapse: collapse; font-size: 14px; }
-th { text-align: left; color: #8b949e; font-size: 12px; font-weight: normal; padding: 6px 10px; }
-td { padding: 8px 10px; border-top: 1px solid #21262d; }
-tr:hover td { background: #1c2128; }
-.badge { display: inline-block; padding: 2px 8px; border-radius: 4px; font-size: 12px; font-weight: bold; }
-.badge-buy { background: #1a4731; color: #3fb950; }
-.badge-sell { background: #3d1f1f; color: #f85149; }
-.badge-tp { background: #1a4731; color: #3fb950; }
-.badge-sl { background: #3d1f1f; color: #f85149; }
-.badge-eod { background: #2d2d1f; color: #e3b341; }
-.empty { color: #484f58; font-style: italic; padding: 12px 10px; display: block; }
-.btn { display: inline-block; padding: 8px 18px; background: #1f6feb; color: #fff; border-radius: 6px; font-size: 14px; border: none; cursor: pointer; }
-.btn:hover { background: #388bfd; text-decoration: none; }
-.status-open { color: #3fb950; font-weight: bold; }
-.status-closed { color: #f85149; font-weight: bold; }
-</style>
-"""
+# The stylesheet lives in static/dashboard.css so browsers cache it (Flask
+# answers repeat loads with 304s) instead of re-downloading it inline with
+# every page.
+BASE_STYLE = '<link rel="stylesheet" href="/static/dashboard.css">\n'
 
 NAV = """
 <div class="nav">
@@ -72,121 +87,238 @@ NAV = """
 </div>
 """
 
+
+def _bake_nav(src: str, active: str) -> str:
+    """Resolve the nav-active placeholders once, before the template compiles."""
+    for key in ("live", "cal", "bt"):
+        src = src.replace('"{%s}"' % key, '"active"' if key == active else '""')
+    return src
+
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 def today_str():
     return datetime.now().strftime("%Y-%m-%d")
 
 def read_csv(path):
-    if not os.path.exists(path):
-        return []
-    try:
-        with open(path, newline="", encoding="utf-8") as fh:
-            return list(csv.DictReader(fh))
-    except Exception:
-        return []
-
-def is_market_open():
-    now = datetime.now(_NY)
-    if now.weekday() >= 5:
-        return False
-    o = now.replace(hour=9, minute=30, second=0, microsecond=0)
-    c = now.replace(hour=16, minute=0,  second=0, microsecond=0)
-    return o <= now <= c
+    # Incremental: only the rows appended since the last refresh get parsed.
+    # Rows are namedtuples — columns read as attributes (row.symbol).
+    return read_csv_rows(path)
+
+def is_market_open(now_ny=None):
+    # Callers that already hold a NY timestamp pass it in — one aware
+    # datetime per request instead of one per check.
+    now = now_ny if now_ny is not None else datetime.now(_NY)
+    return now.weekday() < 5 and _MARKET_OPEN <= now.time() <= _MARKET_CLOSE
+
+# (file mtimes) → account tuple, valid for half a second. Concurrent tabs
+# and SSE-triggered refreshes land within the window and share one
+# computation; the lock makes racing requests coalesce instead of
+# recomputing side by side.
+_ACCT_LOCK = Lock()
+_ACCT_CACHE = {"key": None, "val": None, "t": 0.0}
 
 def get_account_data():
+    starting = _STARTING_BALANCE
+    trades_path = os.path.join(TRADES_DIR, f"trades_{today_str()}.csv")
+    exits_path  = os.path.join(TRADES_DIR, f"exits_{today_str()}.csv")
+
+    def _mtime(p):
+        try:
+            return os.stat(p).st_mtime_ns
+        except OSError:
+            return 0
+
+    key = (_mtime(trades_path), _mtime(exits_path))
+    with _ACCT_LOCK:
+        if (key == _ACCT_CACHE["key"]
+                and time.monotonic() - _ACCT_CACHE["t"] < 0.5):
+            return _ACCT_CACHE["val"]
+        trades = read_csv(trades_path)
+        exits  = read_csv(exits_path)
+        exited_ids  = {r.order_id for r in exits}
+        open_trades = [t for t in trades if t.order_id not in exited_ids
+                       and t.status.startswith("FILLED")]
+        realised   = column_sum(exits_path, "pnl")
+        spent_open = sum(t.entry_price * t.qty for t in open_trades)
+        cash = starting + realised - spent_open
+        val = (starting, cash, realised, open_trades, exits)
+        _ACCT_CACHE["key"] = key
+        _ACCT_CACHE["val"] = val
+        _ACCT_CACHE["t"] = time.monotonic()
+    return val
+
+def _iter_csv(prefix):
+    """DirEntry objects for trades/<prefix>*.csv — one scandir pass.
+
+    Cheaper than glob (no fnmatch) and the entries carry cached stat
+    results, so callers don't pay a second stat per file.
+    """
     try:
-        from config.settings import STARTING_BALANCE
-        starting = STARTING_BALANCE
-    except Exception:
-        starting = 10_000.0
-    trades = read_csv(os.path.join(TRADES_DIR, f"trades_{today_str()}.csv"))
-    exits  = read_csv(os.path.join(TRADES_DIR, f"exits_{today_str()}.csv"))
-    exited_ids  = {r.get("order_id") for r in exits}
-    open_trades = [t for t in trades if t.get("order_id") not in exited_ids
-                   and t.get("status", "").startswith("FILLED")]
-    realised   = sum(float(r.get("pnl", 0)) for r in exits)
-    spent_open = sum(float(t.get("entry_price", 0)) * int(t.get("qty", 0)) for t in open_trades)
-    cash = starting + realised - spent_open
-    return starting, cash, realised, open_trades, exits
+        with os.scandir(TRADES_DIR) as it:
+            for e in it:
+                n = e.name
+                if n.startswith(prefix) and n.endswith(".csv"):
+                    yield e
+    except OSError:
+        return
+
+# Directory mtime → newest results path; trades/ mtime only moves when a
+# file is added/removed there, so most requests skip the directory scan.
+_LBF_CACHE = {"mtime": 0, "path": None}
 
 def latest_backtest_file():
-    files = sorted(glob.glob(os.path.join(TRADES_DIR, "backtest_results_*.csv")), reverse=True)
-    return files[0] if files else None
+    try:
+        m = os.stat(TRADES_DIR).st_mtime_ns
+    except OSError:
+        return None
+    if m != _LBF_CACHE["mtime"]:
+        # Single pass tracking the max name — no full list + sort.
+        latest = None
+        for e in _iter_csv("backtest_results_"):
+            if latest is None or e.name > latest.name:
+                latest = e
+        _LBF_CACHE["mtime"] = m
+        _LBF_CACHE["path"] = latest.path if latest else None
+    return _LBF_CACHE["path"]
 
 # ── Live trading page ─────────────────────────────────────────────────────────
 
+# Static shell — served once; all dynamic content is patched in place by the
+# client-side script below from /api/state JSON, so the CSS/markup is never
+# re-transmitted or re-rendered on a refresh.
 LIVE_HTML = BASE_STYLE + NAV + """
 <h1>AI Day Trading System
-  {% if market_open %}<span style="font-size:14px;color:#3fb950;margin-left:10px;">● MARKET OPEN</span>
-  {% else %}<span style="font-size:14px;color:#f85149;margin-left:10px;">● MARKET CLOSED</span>{% endif %}
+  <span id="mkt" style="font-size:14px;margin-left:10px;">●</span>
 </h1>
-<div class="subtitle">{{ now }}  —  Refreshes every 10s</div>
+<div class="subtitle"><span id="now"></span>  —  Updates when trades change</div>
 
 <div class="cards">
-  <div class="card"><div class="label">Starting Balance</div><div class="value white">${{ "%.2f"|format(starting) }}</div></div>
-  <div class="card"><div class="label">Realised P&amp;L Today</div>
-    <div class="value {% if realised >= 0 %}green{% else %}red{% endif %}">${{ "%+.2f"|format(realised) }}</div></div>
-  <div class="card"><div class="label">Est. Cash</div><div class="value white">${{ "%.2f"|format(cash) }}</div></div>
-  <div class="card"><div class="label">Open Positions</div><div class="value blue">{{ open_trades|length }}</div></div>
-  <div class="card"><div class="label">Closed Today</div><div class="value white">{{ exits|length }}</div></div>
+  <div class="card"><div class="label">Starting Balance</div><div id="v-start" class="value white"></div></div>
+  <div class="card"><div class="label">Realised P&amp;L Today</div><div id="v-real" class="value white"></div></div>
+  <div class="card"><div class="label">Est. Cash</div><div id="v-cash" class="value white"></div></div>
+  <div class="card"><div class="label">Open Positions</div><div id="v-open" class="value blue"></div></div>
+  <div class="card"><div class="label">Closed Today</div><div id="v-closed" class="value white"></div></div>
 </div>
 
 <div class="section">
-  <h2>Open Positions ({{ open_trades|length }})</h2>
-  {% if open_trades %}
-  <table>
-    <tr><th>Symbol</th><th>Side</th><th>Qty</th><th>Entry</th><th>Stop Loss</th><th>Take Profit</th><th>$ Risk</th><th>Conf.</th><th>Time</th></tr>
-    {% for t in open_trades %}
-    <tr>
-      <td><strong>{{ t.symbol }}</strong></td>
-      <td><span class="badge badge-{{ t.side|lower }}">{{ t.side }}</span></td>
-      <td>{{ t.qty }}</td>
-      <td>${{ "%.2f"|format(t.entry_price|float) }}</td>
-      <td class="red">${{ "%.2f"|format(t.stop_loss|float) }}</td>
-      <td class="green">${{ "%.2f"|format(t.take_profit|float) }}</td>
-      <td>${{ "%.2f"|format(t.dollar_risk|float) }}</td>
-      <td>{{ "%.0f"|format(t.confidence|float * 100) }}%</td>
-      <td>{{ t.timestamp[:19] }}</td>
-    </tr>
-    {% endfor %}
-  </table>
-  {% else %}<span class="empty">No open positions — waiting for a setup...</span>{% endif %}
+  <h2>Open Positions (<span id="n-open">0</span>)</h2>
+  <div id="open-tbl"><span class="empty">Loading...</span></div>
 </div>
 
 <div class="section">
-  <h2>Closed Trades Today ({{ exits|length }})</h2>
-  {% if exits %}
-  <table>
-    <tr><th>Symbol</th><th>Side</th><th>Qty</th><th>Entry</th><th>Exit</th><th>P&amp;L</th><th>Result</th><th>Time</th></tr>
-    {% for e in exits|reverse %}
-    <tr>
-      <td><strong>{{ e.symbol }}</strong></td>
-      <td><span class="badge badge-{{ e.side|lower }}">{{ e.side }}</span></td>
-      <td>{{ e.qty }}</td>
-      <td>${{ "%.2f"|format(e.entry_price|float) }}</td>
-      <td>${{ "%.2f"|format(e.exit_price|float) }}</td>
-      <td class="{% if e.pnl|float >= 0 %}green{% else %}red{% endif %}">${{ "%+.2f"|format(e.pnl|float) }}</td>
-      <td><span class="badge {% if e.exit_reason=='TAKE-PROFIT' %}badge-tp{% elif e.exit_reason=='STOP-LOSS' %}badge-sl{% else %}badge-eod{% endif %}">{{ e.exit_reason }}</span></td>
-      <td>{{ e.timestamp[:19] }}</td>
-    </tr>
-    {% endfor %}
-  </table>
-  {% else %}<span class="empty">No closed trades yet today...</span>{% endif %}
+  <h2>Closed Trades Today (<span id="n-closed">0</span>)</h2>
+  <div id="exits-tbl"><span class="empty">Loading...</span></div>
 </div>
-<meta http-equiv="refresh" content="10">
+
+<script>
+const $ = id => document.getElementById(id);
+const usd = v => "$" + v.toFixed(2);
+
+function openRows(ts) {
+  if (!ts.length) return '<span class="empty">No open positions — waiting for a setup...</span>';
+  let h = "<table><tr><th>Symbol</th><th>Side</th><th>Qty</th><th>Entry</th><th>Stop Loss</th><th>Take Profit</th><th>$ Risk</th><th>Conf.</th><th>Time</th></tr>";
+  for (const t of ts) {
+    h += `<tr>
+      <td><strong>${t.symbol}</strong></td>
+      <td><span class="badge badge-${t.side.toLowerCase()}">${t.side}</span></td>
+      <td>${t.qty}</td>
+      <td>${usd(+t.entry_price)}</td>
+      <td class="red">${usd(+t.stop_loss)}</td>
+      <td class="green">${usd(+t.take_profit)}</td>
+      <td>${usd(+t.dollar_risk)}</td>
+      <td>${Math.round(t.confidence * 100)}%</td>
+      <td>${t.timestamp.slice(0, 19)}</td>
+    </tr>`;
+  }
+  return h + "</table>";
+}
+
+function exitRows(es) {
+  if (!es.length) return '<span class="empty">No closed trades yet today...</span>';
+  let h = "<table><tr><th>Symbol</th><th>Side</th><th>Qty</th><th>Entry</th><th>Exit</th><th>P&L</th><th>Result</th><th>Time</th></tr>";
+  for (const e of [...es].reverse()) {
+    const pnl = +e.pnl;
+    const badge = e.exit_reason === "TAKE-PROFIT" ? "badge-tp"
+                : e.exit_reason === "STOP-LOSS"   ? "badge-sl" : "badge-eod";
+    h += `<tr>
+      <td><strong>${e.symbol}</strong></td>
+      <td><span class="badge badge-${e.side.toLowerCase()}">${e.side}</span></td>
+      <td>${e.qty}</td>
+      <td>${usd(+e.entry_price)}</td>
+      <td>${usd(+e.exit_price)}</td>
+      <td class="${pnl >= 0 ? "green" : "red"}">$${pnl >= 0 ? "+" : ""}${pnl.toFixed(2)}</td>
+      <td><span class="badge ${badge}">${e.exit_reason}</span></td>
+      <td>${e.timestamp.slice(0, 19)}</td>
+    </tr>`;
+  }
+  return h + "</table>";
+}
+
+async function refresh() {
+  const s = await (await fetch("/api/state")).json();
+  $("mkt").textContent = "● MARKET " + (s.market_open ? "OPEN" : "CLOSED");
+  $("mkt").style.color = s.market_open ? "#3fb950" : "#f85149";
+  $("now").textContent = s.now;
+  $("v-start").textContent = usd(s.starting);
+  $("v-real").textContent = "$" + (s.realised >= 0 ? "+" : "") + s.realised.toFixed(2);
+  $("v-real").className = "value " + (s.realised >= 0 ? "green" : "red");
+  $("v-cash").textContent = usd(s.cash);
+  $("v-open").textContent = $("n-open").textContent = s.open_trades.length;
+  $("v-closed").textContent = $("n-closed").textContent = s.exits.length;
+  $("open-tbl").innerHTML = openRows(s.open_trades);
+  $("exits-tbl").innerHTML = exitRows(s.exits);
+}
+
+refresh();
+new EventSource("/events").onmessage = refresh;
+</script>
 """
 
+# The live shell has no per-request data, so it is rendered exactly once.
+_LIVE_PAGE = app.jinja_env.from_string(_bake_nav(LIVE_HTML, "live")).render()
+
+
 @app.route("/")
 def live():
+    return _LIVE_PAGE
+
+@app.route("/api/state")
+def api_state():
+    """Current dashboard state as JSON — polled by the live page on SSE ticks."""
     starting, cash, realised, open_trades, exits = get_account_data()
-    return render_template_string(
-        LIVE_HTML,
-        now=datetime.now().strftime("%I:%M:%S %p  %b %d, %Y"),
-        market_open=is_market_open(),
+    now_ny = datetime.now(_NY)
+    return jsonify(
+        now=now_ny.strftime("%I:%M:%S %p  %b %d, %Y"),
+        market_open=is_market_open(now_ny),
         starting=starting, cash=cash, realised=realised,
-        open_trades=open_trades, exits=exits,
-    ).replace('"{live}"', '"active"').replace('"{cal}"', '""').replace('"{bt}"', '""')
+        # namedtuples serialise as JSON arrays — send keyed objects instead
+        open_trades=[t._asdict() for t in open_trades],
+        exits=[e._asdict() for e in exits],
+    )
+
+@app.route("/events")
+def events():
+    """Server-sent events — one message per trades/ change, 30 s heartbeat.
+
+    The stream ends after a single message and the browser's EventSource
+    auto-reconnects: waitress has no async support, so a never-ending
+    generator would pin one worker thread per open tab for good.
+    Terminating per message returns the thread to the pool between
+    events (waits are still blocking, hence the raised thread count in
+    the entry point).
+    """
+    def stream():
+        gen = _change_gen
+        with _change_cond:
+            fired = _change_cond.wait_for(lambda: _change_gen != gen,
+                                          timeout=30)
+        # Without watchdog the wait always times out; degrade to a 30 s
+        # reload instead of never updating.
+        if fired or Observer is None:
+            yield "data: change\n\n"
+        else:
+            yield ": heartbeat\n\n"
+    return Response(stream(), mimetype="text/event-stream")
 
 # ── Calendar page ─────────────────────────────────────────────────────────────
 
@@ -225,58 +357,157 @@ CAL_HTML = BASE_STYLE + NAV + """
 {% endfor %}
 """
 
+# Compiled once at import — render_template_string would re-parse the whole
+# template on every request.
+_CAL_TMPL = app.jinja_env.from_string(_bake_nav(CAL_HTML, "cal"))
+
+
+def _etag(paths):
+    """Content signature for CSV-backed pages: file stats plus today's date.
+
+    Matching If-None-Match turns a refresh into a zero-body 304 — the
+    common case is "no new trades since the last look". The date term
+    keeps the tag from surviving a day/year rollover.
+    """
+    sig = [today_str()]
+    for p in sorted(paths):
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        sig.append(f"{p}:{st.st_mtime_ns}:{st.st_size}")
+    return hashlib.md5("|".join(sig).encode()).hexdigest()
+
+
+def _not_modified(sig):
+    """Zero-body 304 if the client already holds `sig`, else None.
+
+    Checked before rendering so an up-to-date client skips the whole
+    aggregate-and-render step, not just the transfer.
+    """
+    if request.headers.get("If-None-Match") == sig:
+        return Response(status=304, headers={"ETag": sig})
+    return None
+
+
+def _tagged(body, sig):
+    """Wrap a rendered page (string or stream) with its ETag.
+
+    no-cache forces revalidation — clients must present the tag and take
+    the 304 rather than reuse a stale copy.
+    """
+    return Response(body, mimetype="text/html",
+                    headers={"ETag": sig, "Cache-Control": "no-cache"})
+
+
+# path → ((mtime_ns, size), {day: [pnl, trades]}) — historical exit files
+# never change, so each calendar hit re-aggregates only files that did.
+_CAL_CACHE = {}
+
+
+def _day_aggregate(path, date_col):
+    """Per-day [pnl, trades] sums for one exit/backtest file, stat-cached.
+
+    These files are written by our own csv.writer with a fixed schema and
+    no quoted fields, so each line is split directly instead of going
+    through the csv state machine — and the aggregation keeps only the
+    per-day totals, not a row list, for what are mostly historical files.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        _CAL_CACHE.pop(path, None)
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _CAL_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    agg = {}
+    try:
+        with open(path, encoding="utf-8", errors="replace") as fh:
+            header = fh.readline().rstrip("\n").split(",")
+            try:
+                d_i = header.index(date_col)
+                p_i = header.index("pnl")
+            except ValueError:        # unexpected schema — nothing to sum
+                _CAL_CACHE[path] = (key, agg)
+                return agg
+            width = max(d_i, p_i)
+            for line in fh:
+                parts = line.rstrip("\n").split(",")
+                if len(parts) <= width:
+                    continue
+                try:
+                    pnl = float(parts[p_i])
+                except ValueError:
+                    pnl = 0.0
+                day = parts[d_i][:10]
+                entry = agg.get(day)
+                if entry is None:
+                    entry = agg[day] = [0.0, 0]
+                entry[0] += pnl
+                entry[1] += 1
+    except OSError:
+        return agg
+    _CAL_CACHE[path] = (key, agg)
+    return agg
+
+
 @app.route("/calendar")
 def cal():
     # Gather all exit files for this year
     year = datetime.now().year
-    day_data = defaultdict(lambda: {"pnl": 0.0, "trades": 0})
+    prefix = str(year)
+    all_exit_files = [e.path for e in _iter_csv("exits_")]
+    bt_file = latest_backtest_file()
 
-    all_exit_files = glob.glob(os.path.join(TRADES_DIR, "exits_*.csv"))
+    sig = _etag(all_exit_files + ([bt_file] if bt_file else []))
+    resp = _not_modified(sig)
+    if resp is not None:
+        return resp
+
+    day_data = defaultdict(lambda: {"pnl": 0.0, "trades": 0})
     for f in all_exit_files:
-        for row in read_csv(f):
-            ts = row.get("timestamp", "")[:10]
-            if ts.startswith(str(year)):
-                day_data[ts]["pnl"]    += float(row.get("pnl", 0))
-                day_data[ts]["trades"] += 1
+        for day, (pnl, n) in _day_aggregate(f, "timestamp").items():
+            if day.startswith(prefix):
+                day_data[day]["pnl"]    += pnl
+                day_data[day]["trades"] += n
 
     # Also include backtest exits for this year
-    bt_file = latest_backtest_file()
     if bt_file:
-        for row in read_csv(bt_file):
-            ts = row.get("exit_date", "")[:10]
-            if ts.startswith(str(year)):
-                day_data[ts]["pnl"]    += float(row.get("pnl", 0))
-                day_data[ts]["trades"] += 1
+        for day, (pnl, n) in _day_aggregate(bt_file, "exit_date").items():
+            if day.startswith(prefix):
+                day_data[day]["pnl"]    += pnl
+                day_data[day]["trades"] += n
 
     months = []
+    grid = calendar.Calendar()      # firstweekday=0, same as monthcalendar
     for month_num in range(1, 13):
         month_name = date(year, month_num, 1).strftime("%B")
-        cal_weeks  = calendar.monthcalendar(year, month_num)
-        weeks = []
+        weeks, row_data = [], []
         month_pnl, month_trades = 0.0, 0
-        for week in cal_weeks:
-            row_data = []
-            for day in week:
-                if day == 0:
-                    row_data.append((None, None))
+        # itermonthdates hands back real dates, so the cell key is just
+        # isoformat() — no per-cell f-string assembly.
+        for d in grid.itermonthdates(year, month_num):
+            if d.month != month_num:
+                row_data.append((None, None))
+            else:
+                dd = day_data.get(d.isoformat())
+                if dd and dd["trades"] > 0:
+                    month_pnl    += dd["pnl"]
+                    month_trades += dd["trades"]
+                    row_data.append((d.day, dd))
                 else:
-                    key = f"{year}-{month_num:02d}-{day:02d}"
-                    d = day_data.get(key)
-                    if d and d["trades"] > 0:
-                        month_pnl    += d["pnl"]
-                        month_trades += d["trades"]
-                        row_data.append((day, d))
-                    else:
-                        row_data.append((day, None))
-            weeks.append(row_data)
+                    row_data.append((d.day, None))
+            if len(row_data) == 7:
+                weeks.append(row_data)
+                row_data = []
         months.append((
             month_num, month_name, weeks,
             {"pnl": month_pnl, "trades": month_trades},
         ))
 
-    return render_template_string(
-        CAL_HTML, year=year, months=months,
-    ).replace('"{live}"', '""').replace('"{cal}"', '"active"').replace('"{bt}"', '""')
+    return _tagged(_CAL_TMPL.render(year=year, months=months), sig)
 
 # ── Backtest page ─────────────────────────────────────────────────────────────
 
@@ -311,9 +542,9 @@ BT_HTML = BASE_STYLE + NAV + """
       <td>{{ t.qty }}</td>
       <td>{{ t.entry_date[:10] }}</td>
       <td>{{ t.exit_date[:10] }}</td>
-      <td>${{ "%.2f"|format(t.entry_price|float) }}</td>
-      <td>${{ "%.2f"|format(t.exit_price|float) }}</td>
-      <td class="{% if t.pnl|float >= 0 %}green{% else %}red{% endif %}">${{ "%+.2f"|format(t.pnl|float) }}</td>
+      <td>${{ "%.2f"|format(t.entry_price) }}</td>
+      <td>${{ "%.2f"|format(t.exit_price) }}</td>
+      <td class="{% if t.pnl >= 0 %}green{% else %}red{% endif %}">${{ "%+.2f"|format(t.pnl) }}</td>
       <td>{{ t.rr_ratio }}</td>
       <td><span class="badge {% if t.exit_reason=='TAKE-PROFIT' %}badge-tp{% elif t.exit_reason=='STOP-LOSS' %}badge-sl{% else %}badge-eod{% endif %}">{{ t.exit_reason }}</span></td>
     </tr>
@@ -323,54 +554,93 @@ BT_HTML = BASE_STYLE + NAV + """
 </div>
 {% else %}
 <div class="section">
-  <span class="empty">&#9203; Backtest is running in the background — auto-refreshing every 15 seconds...</span>
+  <span class="empty">&#9203; Backtest is running in the background — this page reloads when results land...</span>
 </div>
-<meta http-equiv="refresh" content="15">
+<script>new EventSource("/events").onmessage = () => location.reload();</script>
 {% endif %}
 """
 
+_BT_TMPL = app.jinja_env.from_string(_bake_nav(BT_HTML, "bt"))
+
+
 @app.route("/backtest")
 def backtest_page():
     bt_file = latest_backtest_file()
-    trades  = read_csv(bt_file) if bt_file else []
+
+    sig = _etag([bt_file] if bt_file else [])
+    resp = _not_modified(sig)
+    if resp is not None:
+        return resp
+
+    # save_csv overwrites this file on a same-day rerun, so don't assume
+    # the cached prefix is still valid — reparse on any stat change.
+    trades  = read_csv_rows(bt_file, append_only=False) if bt_file else []
 
     summary = None
     if trades:
-        wins   = [t for t in trades if float(t.get("pnl", 0)) > 0]
-        losses = [t for t in trades if float(t.get("pnl", 0)) <= 0]
-        total_pnl = sum(float(t.get("pnl", 0)) for t in trades)
-        gross_win  = sum(float(t.get("pnl", 0)) for t in wins)
-        gross_loss = abs(sum(float(t.get("pnl", 0)) for t in losses))
+        # One pass over the trade list instead of five comprehensions/sums —
+        # the YTD file runs to thousands of rows.
+        total_pnl = gross_win = gross_loss = 0.0
+        n_wins = n_losses = 0
+        for t in trades:
+            p = t.pnl
+            total_pnl += p
+            if p > 0:
+                gross_win += p
+                n_wins += 1
+            else:
+                gross_loss -= p
+                n_losses += 1
         summary = {
             "total":    len(trades),
-            "win_rate": len(wins) / len(trades) * 100 if trades else 0,
+            "win_rate": n_wins / len(trades) * 100,
             "pnl":      total_pnl,
-            "avg_win":  gross_win  / len(wins)   if wins   else 0,
-            "avg_loss": gross_loss / len(losses) if losses else 0,
-            "pf":       gross_win / gross_loss   if gross_loss > 0 else 0,
+            "avg_win":  gross_win  / n_wins   if n_wins   else 0,
+            "avg_loss": gross_loss / n_losses if n_losses else 0,
+            "pf":       gross_win / gross_loss if gross_loss > 0 else 0,
         }
 
-    return render_template_string(
-        BT_HTML,
+    # Stream the render: the YTD table runs to thousands of rows, and
+    # Template.stream sends the header + summary cards before the row
+    # loop starts, instead of buffering the whole page string first.
+    stream = _BT_TMPL.stream(
         year=datetime.now().year,
         trades=trades,
         summary=summary,
-    ).replace('"{live}"', '""').replace('"{cal}"', '""').replace('"{bt}"', '"active"')
+    )
+    stream.enable_buffering(50)     # ~50 template events per network write
+    return _tagged(stream_with_context(stream), sig)
+
+# ── Backtest worker ───────────────────────────────────────────────────────────
+# One long-lived worker process instead of `python backtest.py` per run —
+# the heavy imports (pandas/numpy/numba) load once, on the first submit,
+# and later runs reuse the warm interpreter and its bar cache.
+_BT_POOL = None
+_BT_FUTURE = None
+
+
+def _bt_job(days):
+    import backtest
+    backtest.run(days)
+
+
+def _submit_backtest(days):
+    """Queue a backtest on the worker; a run already in flight is reused."""
+    global _BT_POOL, _BT_FUTURE
+    if _BT_FUTURE is not None and not _BT_FUTURE.done():
+        return
+    if _BT_POOL is None:
+        _BT_POOL = ProcessPoolExecutor(max_workers=1)
+    _BT_FUTURE = _BT_POOL.submit(_bt_job, days)
+
 
 @app.route("/run-backtest")
 def run_backtest():
-    """Trigger a YTD backtest in a subprocess, then redirect back."""
+    """Queue a YTD backtest on the worker, then redirect back."""
     days_this_year = (datetime.now() - datetime(datetime.now().year, 1, 1)).days + 1
-    try:
-        venv_python = os.path.join("venv", "Scripts", "python.exe")
-        python_exe  = venv_python if os.path.exists(venv_python) else sys.executable
-        subprocess.Popen(
-            [python_exe, "backtest.py", "--days", str(days_this_year)],
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0,
-        )
-    except Exception as e:
-        pass
-    import time; time.sleep(2)
+    _submit_backtest(days_this_year)
+    # No sleep — the backtest page shows the waiting state and reloads
+    # off the /events stream when the results file lands.
     return redirect(url_for("backtest_page"))
 
 # ── Entry point ───────────────────────────────────────────────────────────────
@@ -379,20 +649,12 @@ def open_browser():
     webbrowser.open("http://localhost:5001")
 
 def _auto_run_backtest():
-    """Kick off a YTD backtest in the background if no results file exists yet."""
+    """Queue a YTD backtest in the background if no results file exists yet."""
     if latest_backtest_file():
         return  # Already have data
     days_this_year = (datetime.now() - datetime(datetime.now().year, 1, 1)).days + 1
-    venv_python = os.path.join("venv", "Scripts", "python.exe")
-    python_exe  = venv_python if os.path.exists(venv_python) else sys.executable
-    try:
-        subprocess.Popen(
-            [python_exe, "backtest.py", "--days", str(days_this_year)],
-            creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0,
-        )
-        print("  Auto-running YTD backtest in the background (~30s)...")
-    except Exception:
-        pass
+    _submit_backtest(days_this_year)
+    print("  Auto-running YTD backtest in the background (~30s)...")
 
 
 if __name__ == "__main__":
@@ -400,5 +662,14 @@ if __name__ == "__main__":
     print("  Opening at http://localhost:5001 ...")
     print("  Press Ctrl-C to stop.\n")
     _auto_run_backtest()
+    _start_watcher()
     Timer(1.5, open_browser).start()
-    app.run(host="localhost", port=5001, debug=False)
+    try:
+        # Production WSGI server — handles concurrent tabs/SSE streams,
+        # unlike the single-threaded Werkzeug dev server. Each connected
+        # tab blocks a thread for up to 30 s inside /events, so keep the
+        # pool well above the expected tab count.
+        from waitress import serve
+        serve(app, host="127.0.0.1", port=5001, threads=16)
+    except ImportError:
+        app.run(host="localhost", port=5001, debug=False)